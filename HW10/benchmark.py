@@ -0,0 +1,279 @@
+import argparse
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from int_nd import integrate_nd_box
+from riemann_nd import (riemann_integral_1d, riemann_integral_nd,
+                        romberg_integral_1d, romberg_integral_nd)
+
+
+# ================= 已知答案的被積函數 =================
+# 每個函數都是向量化的：x shape (..., d)，回傳 shape (...)，積分區域為 [0,1]^d。
+# Genz 測試函數的係數 a、位移 u 固定，讓不同版本的結果可以直接比較。
+
+def _genz_coeffs(d):
+    a = np.linspace(1.0, 2.0, d) if d > 1 else np.array([1.5])
+    u = np.full(d, 0.3)
+    return a, u
+
+
+def make_polynomial(d):
+    # f(x) = Σ x_j^2，積分 = d / 3
+    def f(x):
+        return np.sum(x ** 2, axis=-1)
+    return f, d / 3.0
+
+
+def make_oscillatory(d):
+    # Genz oscillatory：cos(2π u1 + Σ a_j x_j)
+    a, u = _genz_coeffs(d)
+    a = 3.0 * a
+
+    def f(x):
+        return np.cos(2 * math.pi * u[0] + np.sum(a * x, axis=-1))
+    # ∫ e^{i(2πu1 + a·x)} = e^{i 2πu1} Π (e^{i a_j} - 1) / (i a_j)，取實部
+    z = np.exp(1j * 2 * math.pi * u[0]) * np.prod((np.exp(1j * a) - 1) / (1j * a))
+    return f, float(z.real)
+
+
+def make_product_peak(d):
+    # Genz product peak：Π 1 / (a_j^-2 + (x_j - u_j)^2)
+    a, u = _genz_coeffs(d)
+    a = 5.0 * a
+
+    def f(x):
+        return np.prod(1.0 / (a ** -2 + (x - u) ** 2), axis=-1)
+    exact = np.prod(a * (np.arctan(a * (1 - u)) + np.arctan(a * u)))
+    return f, float(exact)
+
+
+def make_gaussian(d):
+    # Genz Gaussian：exp(-Σ a_j^2 (x_j - u_j)^2)
+    a, u = _genz_coeffs(d)
+    a = 3.0 * a
+
+    def f(x):
+        return np.exp(-np.sum(a ** 2 * (x - u) ** 2, axis=-1))
+    erf = np.vectorize(math.erf)
+    exact = np.prod(math.sqrt(math.pi) / (2 * a) * (erf(a * (1 - u)) + erf(a * u)))
+    return f, float(exact)
+
+
+def make_continuous(d):
+    # Genz continuous（C0，頂點不可微）：exp(-Σ a_j |x_j - u_j|)
+    a, u = _genz_coeffs(d)
+
+    def f(x):
+        return np.exp(-np.sum(a * np.abs(x - u), axis=-1))
+    exact = np.prod((2 - np.exp(-a * u) - np.exp(-a * (1 - u))) / a)
+    return f, float(exact)
+
+
+def make_discontinuous(d):
+    # Genz discontinuous：x1 > u1 或 x2 > u2 時為 0，否則 exp(Σ a_j x_j)
+    a, u = _genz_coeffs(d)
+    k = min(d, 2)
+
+    def f(x):
+        inside = np.all(x[..., :k] <= u[:k], axis=-1)
+        return np.where(inside, np.exp(np.sum(a * x, axis=-1)), 0.0)
+    upper = np.ones(d)
+    upper[:k] = u[:k]
+    exact = np.prod((np.exp(a * upper) - 1) / a)
+    return f, float(exact)
+
+
+CATALOG = {
+    "polynomial": make_polynomial,
+    "oscillatory": make_oscillatory,
+    "product_peak": make_product_peak,
+    "gaussian": make_gaussian,
+    "continuous": make_continuous,
+    "discontinuous": make_discontinuous,
+}
+
+
+# ================= 各積分器的呼叫方式 =================
+# 每個 runner(f, d, level) 回傳積分估計值；level 由小到大代表成本越來越高。
+
+def _run_riemann_1d(f, d, level):
+    n = 4 ** (level + 1)
+    return riemann_integral_1d(lambda t: f(np.asarray(t)[..., np.newaxis]),
+                               0.0, 1.0, n=n, method="midpoint")
+
+
+def _run_romberg_1d(f, d, level):
+    return romberg_integral_1d(lambda t: f(np.asarray(t)[..., np.newaxis]),
+                               0.0, 1.0, tol=0.0, max_levels=2 * level + 2)[0]
+
+
+def _run_riemann_nd(f, d, level):
+    return riemann_integral_nd(f, [(0.0, 1.0)] * d, 2 ** (level + 1), vectorized=True)
+
+
+def _run_romberg_nd(f, d, level):
+    return romberg_integral_nd(f, [(0.0, 1.0)] * d, tol=0.0, max_levels=level + 1,
+                               vectorized=True)[0]
+
+
+def _run_monte_carlo(f, d, level):
+    return integrate_nd_box(f, [(0.0, 1.0)] * d, num_samples=10 ** (level + 2),
+                            rng=np.random.default_rng(level), vectorized=True)[0]
+
+
+# (名稱, runner, 只支援 1 維?, 格點數 ≈ points(d, level))
+INTEGRATORS = {
+    "riemann_1d": (_run_riemann_1d, True, lambda d, k: 4 ** (k + 1)),
+    "romberg_1d": (_run_romberg_1d, True, lambda d, k: 2 ** (2 * k + 2) + 1),
+    "riemann_nd": (_run_riemann_nd, False, lambda d, k: (2 ** (k + 1)) ** d),
+    "romberg_nd": (_run_romberg_nd, False, lambda d, k: (2 ** (k + 1) + 1) ** d),
+    "monte_carlo": (_run_monte_carlo, False, lambda d, k: 10 ** (k + 2)),
+}
+
+
+class CountingIntegrand:
+    """
+    包一層被積函數，累計實際被計算的點數。
+    各積分器每個點都只算一次，所以這就是用到的不同點數；變多代表有點被重複計算。
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.evaluations = 0
+
+    def __call__(self, x):
+        values = self.f(x)
+        self.evaluations += int(np.size(values))
+        return values
+
+
+def measure(runner, f, d, level):
+    """
+    執行積分，回傳 (估計值, 秒數, f 計算的點數, 峰值記憶體 bytes)。
+    計時的那一次直接用 f、不開 tracemalloc（它會拖慢 Python 迴圈多的 1 維積分器）；
+    點數與峰值記憶體另外再跑一次量。
+    """
+    t0 = time.perf_counter()
+    estimate = runner(f, d, level)
+    elapsed = time.perf_counter() - t0
+
+    counted = CountingIntegrand(f)
+    tracemalloc.start()
+    runner(counted, d, level)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(estimate), elapsed, counted.evaluations, peak
+
+
+def run_suite(dims=(1, 2, 3, 5), levels=4, max_points=2_000_000,
+              integrands=None, integrators=None):
+    """
+    對 CATALOG × INTEGRATORS × 維度 × 成本等級 逐一量測。
+
+    回傳：list[dict]，每筆包含 integrand, integrator, dim, level,
+    estimate, exact, abs_error, rel_error, seconds, evaluations, peak_bytes。
+    """
+    integrands = integrands or list(CATALOG)
+    integrators = integrators or list(INTEGRATORS)
+    results = []
+    for name in integrands:
+        for d in dims:
+            f, exact = CATALOG[name](d)
+            for method in integrators:
+                runner, only_1d, points = INTEGRATORS[method]
+                if only_1d and d != 1:
+                    continue
+                for level in range(levels):
+                    # 格點法的點數隨維度指數成長，超過上限就跳過
+                    if points(d, level) > max_points:
+                        break
+                    estimate, seconds, evals, peak = measure(runner, f, d, level)
+                    results.append({
+                        "integrand": name,
+                        "integrator": method,
+                        "dim": d,
+                        "level": level,
+                        "estimate": estimate,
+                        "exact": exact,
+                        "abs_error": abs(estimate - exact),
+                        "rel_error": abs(estimate - exact) / abs(exact),
+                        "seconds": seconds,
+                        "evaluations": evals,
+                        "peak_bytes": peak,
+                    })
+    return results
+
+
+def _key(r):
+    return (r["integrand"], r["integrator"], r["dim"], r["level"])
+
+
+def compare(results, baseline, time_ratio=1.5, error_ratio=1.5, min_seconds=1e-3):
+    """
+    和之前存下來的結果比較，回傳退步的項目
+    （時間或誤差超過 baseline 的 ratio 倍，或計算次數變多）。
+    短於 min_seconds 的量測雜訊太大，不拿來比較時間。
+    """
+    base = {_key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = base.get(_key(r))
+        if old is None:
+            continue
+        slower = (r["seconds"] > min_seconds
+                  and r["seconds"] > time_ratio * old["seconds"])
+        worse = r["abs_error"] > error_ratio * old["abs_error"] + 1e-15
+        more_evals = r["evaluations"] > old["evaluations"]
+        if slower or worse or more_evals:
+            regressions.append((r, old))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'integrand':14s} {'method':12s} {'d':>2s} {'lv':>2s} "
+          f"{'abs_error':>10s} {'rel_error':>10s} {'seconds':>9s} {'evals':>10s} {'peak_MB':>8s}")
+    for r in results:
+        print(f"{r['integrand']:14s} {r['integrator']:12s} {r['dim']:2d} {r['level']:2d} "
+              f"{r['abs_error']:10.3e} {r['rel_error']:10.3e} {r['seconds']:9.4f} {r['evaluations']:10d} "
+              f"{r['peak_bytes'] / 2 ** 20:8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="積分器的成本 / 精度 benchmark")
+    parser.add_argument("--dims", type=int, nargs="+", default=[1, 2, 3, 5])
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--max-points", type=int, default=2_000_000)
+    parser.add_argument("--integrands", nargs="+", choices=list(CATALOG))
+    parser.add_argument("--integrators", nargs="+", choices=list(INTEGRATORS))
+    parser.add_argument("--output", help="把結果寫成 JSON 檔")
+    parser.add_argument("--baseline", help="和之前的 JSON 結果比較，列出退步的項目")
+    args = parser.parse_args()
+
+    results = run_suite(dims=args.dims, levels=args.levels, max_points=args.max_points,
+                        integrands=args.integrands, integrators=args.integrators)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, fp, indent=2)
+        print(f"\n結果已寫入 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)["results"]
+        regressions = compare(results, baseline)
+        print(f"\n與 {args.baseline} 比較：{len(regressions)} 項退步")
+        for r, old in regressions:
+            print(f"  {_key(r)}: seconds {old['seconds']:.4f} -> {r['seconds']:.4f}, "
+                  f"abs_error {old['abs_error']:.3e} -> {r['abs_error']:.3e}, "
+                  f"evals {old['evaluations']} -> {r['evaluations']}")
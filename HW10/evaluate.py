@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+
+
+def _eval_chunk(f, chunk):
+    # 逐點計算一塊樣本點（放在模組層級，process pool 才能 pickle）
+    return [f(x) for x in chunk]
+
+
+def _try_vectorized(f, flat):
+    """
+    試著把 f 當成向量化函數呼叫，成功時回傳 shape (m,) 的值，否則回傳 None。
+
+    試探用 n + 1 個點（n 是維度）：純量寫法的 f 收到 (k, n) 陣列時，
+    像 x[0]**2 + x[1]**2 這種寫法會回傳 shape (n,)，點數不等於 n 才不會被誤判。
+    """
+    m, n = flat.shape
+    k = n + 1
+    if m <= n:
+        return None                     # 點太少無法分辨，直接逐點算
+    try:
+        head = np.asarray(f(flat[:k]), dtype=float)
+        if head.shape != (k,):
+            return None
+        rest = np.asarray(f(flat[k:]), dtype=float) if m > k else np.empty(0)
+    except Exception:
+        return None
+    if rest.shape != (m - k,):
+        return None
+    return np.concatenate([head, rest])
+
+
+def evaluate_points(f, points, vectorized="auto", workers=None, executor="thread"):
+    """
+    在一批點上計算被積函數 f。
+
+    參數：
+        f : callable
+            被積函數。向量化版本接受 shape (..., n) 回傳 shape (...)；
+            純量版本一次只吃一個長度 n 的向量，回傳一個實數。
+        points : np.ndarray
+            shape (..., n)，最後一維是座標。
+        vectorized : True | False | "auto"
+            True  : 直接整批呼叫 f(points)。
+            False : 逐點呼叫 f(x)，分塊交給 thread / process pool。
+            "auto": 先用 n + 1 個點試探 f 是否支援向量化，成功才對其餘的點整批呼叫
+                    （試探的結果會保留，不會重算）；整批呼叫失敗或 shape 不對時改走逐點路徑。
+        workers : int | None
+            純量路徑使用的 worker 數，None 代表 os.cpu_count()，1 代表不開 pool。
+        executor : "thread" | "process"
+            純量路徑使用的 pool 種類。f 會釋放 GIL（例如呼叫 NumPy）時用 thread 即可；
+            純 Python 的 f 用 process 才能吃滿多核心，但 f 必須可以 pickle。
+
+    回傳：
+        values : np.ndarray, shape points.shape[:-1]
+    """
+    points = np.asarray(points, dtype=float)
+    out_shape = points.shape[:-1]
+
+    if vectorized == "auto":
+        flat = points.reshape(-1, points.shape[-1])
+        values = _try_vectorized(f, flat)
+        if values is not None:
+            return values.reshape(out_shape)
+        vectorized = False
+
+    if vectorized is True:
+        values = np.asarray(f(points), dtype=float)
+        if values.shape != out_shape:
+            raise ValueError(f"f 回傳的 shape 應為 {out_shape}，實際為 {values.shape}")
+        return values
+    if vectorized is not False:
+        raise ValueError(f"未知的 vectorized: {vectorized}")
+
+    # ===== 純量路徑：逐點計算，分塊平行 =====
+    flat = points.reshape(-1, points.shape[-1])
+    total = flat.shape[0]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or total < 2:
+        return np.array(_eval_chunk(f, flat), dtype=float).reshape(out_shape)
+
+    if executor == "thread":
+        pool_cls = ThreadPoolExecutor
+    elif executor == "process":
+        pool_cls = ProcessPoolExecutor
+    else:
+        raise ValueError(f"未知的 executor: {executor}")
+
+    # 每個 worker 分到數塊，讓負載比較平均
+    n_chunks = min(total, workers * 4)
+    chunks = np.array_split(flat, n_chunks)
+    values = np.empty(total, dtype=float)
+    with pool_cls(max_workers=workers) as pool:
+        start = 0
+        for chunk, result in zip(chunks, pool.map(_eval_chunk, [f] * n_chunks, chunks)):
+            values[start:start + len(chunk)] = result
+            start += len(chunk)
+    return values.reshape(out_shape)
+
+
+def batch_bounds_and_params(bounds, params):
+    """
+    把 bounds 與 params 整理成一致的批次形狀。
+
+    bounds 可以是 (n, 2)（所有 case 共用）或 (B, n, 2)；
+    params 可以是 None、(B,) 或 (B, p)。
+    回傳 bounds shape: (B, n, 2)，params shape: (B, p) 或 None。
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim == 2:
+        bounds = bounds[np.newaxis]
+    if bounds.ndim != 3 or bounds.shape[-1] != 2:
+        raise ValueError("bounds 必須是 (n, 2) 或 (B, n, 2)")
+
+    if params is not None:
+        params = np.asarray(params, dtype=float)
+        if params.ndim == 1:
+            params = params[:, np.newaxis]
+        if params.ndim != 2:
+            raise ValueError("params 必須是 (B,) 或 (B, p)")
+        if bounds.shape[0] == 1:
+            bounds = np.broadcast_to(bounds, (params.shape[0],) + bounds.shape[1:])
+        elif bounds.shape[0] != params.shape[0]:
+            raise ValueError("bounds 與 params 的批次大小 B 必須相同")
+    return bounds, params
@@ -1,6 +1,8 @@
 import numpy as np
 import math
 
+from evaluate import batch_bounds_and_params, evaluate_points
+
 def riemann_integral_1d(f, a, b, n=1000, method="midpoint"):
     """
     用黎曼和近似計算一維積分 ∫_a^b f(x) dx
@@ -22,36 +24,39 @@ def riemann_integral_1d(f, a, b, n=1000, method="midpoint"):
         return -riemann_integral_1d(f, b, a, n=n, method=method)
 
     dx = (b - a) / n
+    # 指定 otypes，np.vectorize 才不會為了判斷輸出型別而多算一次第一個點
+    fv = np.vectorize(f, otypes=[float])
 
     if method == "left":
         # 左端點
         x = a + dx * np.arange(0, n)
-        fx = np.vectorize(f)(x)
+        fx = fv(x)
         return np.sum(fx) * dx
 
     elif method == "right":
         # 右端點
         x = a + dx * np.arange(1, n + 1)
-        fx = np.vectorize(f)(x)
+        fx = fv(x)
         return np.sum(fx) * dx
 
     elif method == "midpoint":
         # 中點
         x = a + dx * (np.arange(0, n) + 0.5)
-        fx = np.vectorize(f)(x)
+        fx = fv(x)
         return np.sum(fx) * dx
 
     elif method == "trapezoid":
         # 梯形法
         x = a + dx * np.arange(0, n + 1)
-        fx = np.vectorize(f)(x)
+        fx = fv(x)
         return (fx[0] + fx[-1] + 2 * np.sum(fx[1:-1])) * dx / 2.0
 
     else:
         raise ValueError(f"未知的 method: {method}")
 
 
-def riemann_integral_nd(f, bounds, divisions, method="midpoint"):
+def riemann_integral_nd(f, bounds, divisions, method="midpoint",
+                        vectorized="auto", workers=None, executor="thread"):
     """
     用規則格點的黎曼和近似計算 n 維積分：
         ∫_Ω f(x1,...,xn) d x
@@ -70,6 +75,12 @@ def riemann_integral_nd(f, bounds, divisions, method="midpoint"):
         method : str
             "midpoint"（目前實作），概念是 n 維中點法。
             （要改成 left/right 也可以，只是樣本點位置不同）
+        vectorized : True | False | "auto"
+            f 是否支援一次吃整個格點陣列；"auto" 會先用少數點試探。
+        workers : int | None
+            f 不支援向量化時，逐點計算所用的 worker 數（None = CPU 核心數）。
+        executor : "thread" | "process"
+            逐點計算使用的 pool 種類，見 evaluate.evaluate_points。
 
     回傳:
         近似的積分值 (float)
@@ -107,20 +118,8 @@ def riemann_integral_nd(f, bounds, divisions, method="midpoint"):
     # 將格點組成最後一維是座標的陣列 points shape: (m1, m2, ..., mn, n_dim)
     stacked = np.stack(mesh, axis=-1)
 
-    # 嘗試向量化呼叫 f
-    try:
-        values = f(stacked)       # 期望回傳 shape: (m1, m2, ..., mn)
-        values = np.asarray(values)
-        if values.shape != stacked.shape[:-1]:
-            raise ValueError
-    except Exception:
-        # 若 f 不支援向量化，就逐點計算
-        it = np.nditer(np.zeros(stacked.shape[:-1]), flags=['multi_index'])
-        values = np.empty(stacked.shape[:-1], dtype=float)
-        for _ in it:
-            idx = it.multi_index
-            point = stacked[idx]      # 長度為 n_dim 的向量
-            values[idx] = f(point)
+    values = evaluate_points(f, stacked, vectorized=vectorized,
+                             workers=workers, executor=executor)
 
     # 每一小格的體積
     cell_volume = np.prod(dx)
@@ -130,12 +129,213 @@ def riemann_integral_nd(f, bounds, divisions, method="midpoint"):
     return integral
 
 
-def riemann_integral_nd_cube(f, n_dim, a=0.0, b=1.0, divisions=20, method="midpoint"):
+def _richardson_row(prev_row, t_new):
+    """
+    Romberg 表的一列：R[k][0] = t_new，
+        R[k][j] = R[k][j-1] + (R[k][j-1] - R[k-1][j-1]) / (4^j - 1)
+    """
+    row = [t_new]
+    for j in range(1, len(prev_row) + 1):
+        row.append(row[j - 1] + (row[j - 1] - prev_row[j - 1]) / (4 ** j - 1))
+    return row
+
+
+# Romberg 至少要細分到這一層才檢查 tol。太早停會被「剛好在少數格點上為 0」的函數騙到，
+# 例如 sin(2πx)^2 在 0、1/2、1 都是 0，第 1 層的兩個外插值都是 0，差也是 0。
+_MIN_LEVELS = 3
+
+
+def romberg_integral_1d(f, a, b, tol=1e-10, max_levels=20):
+    """
+    Romberg 積分：梯形法每次把格子對半切（巢狀格點），再做 Richardson 外插。
+
+    第 k 層只需計算新增的 2^(k-1) 個奇數點，之前算過的 f 值都保留在
+    「加權和」裡重複使用，所以總共只會呼叫 f 約 2^k + 1 次。
+
+    參數:
+        f          : 被積函數 f(x)
+        a, b       : 積分上下限
+        tol        : 至少細分 3 層後，相鄰兩層外插結果的差 <= tol 時停止
+        max_levels : 最多細分幾層
+
+    回傳:
+        estimate  : 積分估計值 (float)
+        error_est : 誤差估計（最後兩層外插值的差）
+    """
+    if max_levels <= 0:
+        raise ValueError("max_levels 必須是正整數")
+    if a == b:
+        return 0.0, 0.0
+    if a > b:
+        est, err = romberg_integral_1d(f, b, a, tol=tol, max_levels=max_levels)
+        return -est, err
+
+    # 指定 otypes，np.vectorize 才不會為了判斷輸出型別而多算一次第一個點
+    fv = np.vectorize(f, otypes=[float])
+    length = b - a
+
+    # level 0：只有兩個端點，加權和 = (f(a) + f(b)) / 2
+    weighted_sum = 0.5 * np.sum(fv(np.array([a, b], dtype=float)))
+    row = [weighted_sum * length]
+    error_est = np.inf
+
+    for k in range(1, max_levels + 1):
+        n = 2 ** k
+        h = length / n
+        # 新增的點是奇數格點 a + (2i+1) h
+        x_new = a + h * (2 * np.arange(n // 2) + 1)
+        weighted_sum = weighted_sum + np.sum(fv(x_new))
+        new_row = _richardson_row(row, weighted_sum * h)
+        error_est = abs(new_row[-1] - row[-1])
+        row = new_row
+        if k >= _MIN_LEVELS and error_est <= tol:
+            break
+
+    return float(row[-1]), float(error_est)
+
+
+def romberg_integral_nd(f, bounds, tol=1e-8, max_levels=8, **kwargs):
+    """
+    n 維 Romberg 積分：張量積梯形法，每層各維同時對半切，再做 Richardson 外插。
+
+    第 k 層的格點是 (2^k + 1)^n 個，其中「每一維索引都是偶數」的點就是
+    上一層的格點，f 值已包含在加權和裡；這一層只計算至少有一維索引為奇數的點。
+
+    參數:
+        f : callable
+            被積函數，與 riemann_integral_nd 相同（可向量化或逐點）。
+        bounds : list[tuple[float, float]]
+            每一維的積分範圍。
+        tol : float
+            至少細分 3 層後，相鄰兩層外插結果的差 <= tol 時停止。
+        max_levels : int
+            最多細分幾層（第 k 層約有 (2^k + 1)^n 個點，n 大時要小心）。
+        **kwargs :
+            vectorized / workers / executor，直接傳給 evaluate_points。
+
+    回傳:
+        estimate  : 積分估計值 (float)
+        error_est : 誤差估計（最後兩層外插值的差）
+    """
+    if max_levels <= 0:
+        raise ValueError("max_levels 必須是正整數")
+    bounds = np.array(bounds, dtype=float)
+    n_dim = bounds.shape[0]
+    a = bounds[:, 0]
+    lengths = bounds[:, 1] - bounds[:, 0]
+
+    def weights_1d(idx, n):
+        # 梯形法權重：端點 1/2，內部 1
+        return np.where((idx == 0) | (idx == n), 0.5, 1.0)
+
+    def weighted_sum_of(index_lists, n):
+        # index_lists[j] 是第 j 維要取的格點索引，計算 Σ w(idx) f(x(idx))
+        if any(len(ix) == 0 for ix in index_lists):
+            return 0.0
+        h = lengths / n
+        grids = [a[j] + h[j] * index_lists[j] for j in range(n_dim)]
+        mesh = np.meshgrid(*grids, indexing='ij')
+        values = evaluate_points(f, np.stack(mesh, axis=-1), **kwargs)
+        w = np.ones(values.shape)
+        for j in range(n_dim):
+            shape = [1] * n_dim
+            shape[j] = -1
+            w = w * weights_1d(index_lists[j], n).reshape(shape)
+        return float(np.sum(w * values))
+
+    # level 0：只有 2^n 個角點
+    corners = [np.array([0, 1])] * n_dim
+    weighted_sum = weighted_sum_of(corners, 1)
+    row = [weighted_sum * np.prod(lengths)]
+    error_est = np.inf
+
+    for k in range(1, max_levels + 1):
+        n = 2 ** k
+        all_idx = np.arange(n + 1)
+        even_idx = all_idx[0::2]
+        odd_idx = all_idx[1::2]
+        # 新點依「第一個奇數索引出現在第 j 維」分成互斥的 n_dim 塊：
+        #   維度 < j 取偶數索引、維度 j 取奇數索引、維度 > j 任意
+        for j in range(n_dim):
+            index_lists = [even_idx] * j + [odd_idx] + [all_idx] * (n_dim - j - 1)
+            weighted_sum += weighted_sum_of(index_lists, n)
+        new_row = _richardson_row(row, weighted_sum * np.prod(lengths / n))
+        error_est = abs(new_row[-1] - row[-1])
+        row = new_row
+        if k >= _MIN_LEVELS and error_est <= tol:
+            break
+
+    return float(row[-1]), float(error_est)
+
+
+def riemann_integral_nd_batch(f, bounds, divisions, params=None):
+    """
+    批次版的 n 維中點黎曼和：同一族被積函數、不同參數或不同積分範圍。
+
+    所有 case 共用同一組單位格點 (中點位於 [0,1]^n)，再用 broadcasting
+    映射到各自的超長方體，只呼叫 f 一次。
+
+    參數:
+        f : callable
+            必須是向量化的被積函數：
+              params 為 None 時呼叫 f(x)，x shape: (B, m1, ..., mn, n)；
+              否則呼叫 f(x, theta)，theta shape: (B, 1, ..., 1, p)，
+              所以 theta[..., k] 可直接和 x[..., j] 做 broadcasting。
+            回傳 shape: (B, m1, ..., mn)。
+        bounds : array_like
+            (n, 2) 所有 case 共用，或 (B, n, 2) 每個 case 各自的範圍。
+        divisions : int 或 list[int]
+            每一維切幾等分。
+        params : array_like | None
+            每個 case 的參數，shape (B,) 或 (B, p)。
+
+    回傳:
+        estimates : np.ndarray, shape (B,)，每個 case 的積分近似值
+        errors    : np.ndarray, shape (B,)，和半解析度格點結果的差（保守的誤差估計）
+    """
+    bounds, params = batch_bounds_and_params(bounds, params)
+    batch, n_dim = bounds.shape[0], bounds.shape[1]
+
+    if isinstance(divisions, int):
+        m_list = [divisions] * n_dim
+    else:
+        if len(divisions) != n_dim:
+            raise ValueError("divisions 長度必須和維度數量相同")
+        m_list = list(divisions)
+
+    lengths = bounds[:, :, 1] - bounds[:, :, 0]          # (B, n)
+    expand = (slice(None),) + (np.newaxis,) * n_dim
+
+    def midpoint_sums(m_list):
+        # 共用的單位格點（中點）unit shape: (m1, ..., mn, n)
+        grids_1d = [(np.arange(mj) + 0.5) / mj for mj in m_list]
+        unit = np.stack(np.meshgrid(*grids_1d, indexing='ij'), axis=-1)
+        points = bounds[:, :, 0][expand] + unit * lengths[expand]  # (B, m1, ..., mn, n)
+
+        if params is None:
+            values = f(points)
+        else:
+            values = f(points, params[expand])
+        values = np.asarray(values, dtype=float)
+        if values.shape != points.shape[:-1]:
+            raise ValueError(f"f 回傳的 shape 應為 {points.shape[:-1]}，實際為 {values.shape}")
+
+        # 每個 case 的小格體積
+        cell_volumes = np.prod(lengths / np.array(m_list, dtype=float), axis=1)
+        return np.sum(values.reshape(batch, -1), axis=1) * cell_volumes
+
+    estimates = midpoint_sums(m_list)
+    # 誤差估計：和每一維只切一半的格點比較（多算約 1/2^n 的點）
+    coarse = midpoint_sums([max(mj // 2, 1) for mj in m_list])
+    return estimates, np.abs(estimates - coarse)
+
+
+def riemann_integral_nd_cube(f, n_dim, a=0.0, b=1.0, divisions=20, method="midpoint", **kwargs):
     """
     方便用的封裝：在 n 維超立方體 [a,b]^n 上做 n 維黎曼積分。
     """
     bounds = [(a, b)] * n_dim
-    return riemann_integral_nd(f, bounds, divisions, method=method)
+    return riemann_integral_nd(f, bounds, divisions, method=method, **kwargs)
 
 
 # ================= 測試區 =================
@@ -172,3 +372,12 @@ if __name__ == "__main__":
     est_3d = riemann_integral_nd_cube(f3_xyz, n_dim=3, a=0.0, b=1.0, divisions=20)
     print("\n3D test: ∫_[0,1]^3 (x^2 + y^2 + z^2) dV")
     print("  estimate =", est_3d, ", exact =", exact_3d, ", error =", abs(est_3d - exact_3d))
+
+    # Romberg 測試：重複使用前一層的 f 值，並做 Richardson 外插
+    est_rb, err_rb = romberg_integral_1d(np.sin, 0.0, math.pi)
+    print("\nRomberg 1D: ∫_0^π sin(x) dx")
+    print("  estimate =", est_rb, ", exact = 2.0, error estimate =", err_rb)
+
+    est_rb, err_rb = romberg_integral_nd(f3_xyz, [(0.0, 1.0)] * 3)
+    print("\nRomberg 3D: ∫_[0,1]^3 (x^2 + y^2 + z^2) dV")
+    print("  estimate =", est_rb, ", exact =", exact_3d, ", error estimate =", err_rb)
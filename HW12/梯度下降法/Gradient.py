@@ -1,13 +1,18 @@
+import os
+import sys
+
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "HW6"))  # 共用 HW6 的模組
+from optimizers import minimize
+from tracer import TraceRecorder, trace_argument_parser
+
 p = np.array([0.5, 0.2, 0.3], dtype=float)
 
 def entropy_bits(p):
     return -np.sum(p * np.log2(p + 1e-12))
 
 target_entropy = entropy_bits(p)
-print(f"Target p: {p}")
-print(f"Target Min Loss (Entropy): {target_entropy:.5f}\n")
 
 def softmax(z):
     z = z - np.max(z)
@@ -17,39 +22,59 @@ def softmax(z):
 def cross_entropy_bits(p, q):
     return -np.sum(p * np.log2(q + 1e-12))
 
-np.random.seed(0)
+def loss_fn(z):
+    return cross_entropy_bits(p, softmax(z))
 
-z = np.zeros(3)
-q = softmax(z)
-loss = cross_entropy_bits(p, q)
+def grad_fn(z):
+    return softmax(z) - p
 
-print("Start Gradient Descent...")
-print(f"Initial q: {q.round(4)}, Loss: {loss:.5f}")
+if __name__ == "__main__":
+    TRACE_PATH = trace_argument_parser().parse_args().trace
+    print(f"Target p: {p}")
+    print(f"Target Min Loss (Entropy): {target_entropy:.5f}\n")
 
-max_iters = 20000
-base_step = 0.4    
-decay = 0.8        
+    np.random.seed(0)
 
-for t in range(max_iters + 1):
+    z = np.zeros(3)
     q = softmax(z)
     loss = cross_entropy_bits(p, q)
 
-    if t % 1000 == 0:
-        step = base_step * (decay ** (t // 1000))
-        print(f"{t:05d}: Loss={loss:.5f} q={q.round(4)} step={step:.5f}")
-
-    grad = q - p
-
-    step = base_step * (decay ** (t // 1000))
-
-    z -= step * grad
-
-print("-" * 60)
-final_q = softmax(z)
-final_loss = cross_entropy_bits(p, final_q)
-
-print("Final Result:")
-print("Optimized q :", final_q.round(4))
-print("Target    p :", p)
-print(f"Final Loss  : {final_loss:.5f}")
-print("Diff (q - p):", final_q - p)
+    print("Start Gradient Descent...")
+    print(f"Initial q: {q.round(4)}, Loss: {loss:.5f}")
+
+    # 每 1000 輪記下 loss、z 與步長，跑完再印出來
+    trace = TraceRecorder(every=1000)
+
+    # 原本的做法：學習率 0.4，每 1000 輪乘上 0.8；梯度夠小 (|grad| <= 1e-8) 就停，不必跑滿 20000 輪
+    result = minimize(loss_fn, grad_fn, z, optimizer="sgd", lr=0.4, decay=0.8, every=1000,
+                      max_iters=20000, grad_tol=1e-8, trace=trace)
+    z = result["x"]
+
+    trace.print_summary(fmt=lambda r: f"{int(r[0]):05d}: Loss={r[1]:.5f} "
+                                      f"q={softmax(r[4:]).round(4)} step={r[2]:.5f}")
+    if TRACE_PATH:
+        trace.save(TRACE_PATH)
+
+    print("-" * 60)
+    final_q = softmax(z)
+    final_loss = cross_entropy_bits(p, final_q)
+
+    print("Final Result:")
+    print("Optimized q :", final_q.round(4))
+    print("Target    p :", p)
+    print(f"Final Loss  : {final_loss:.5f}")
+    print("Diff (q - p):", final_q - p)
+    print(f"Iterations  : {result['iterations']} ({result['reason']})")
+
+    # 比較不同的 optimizer：都要求 |grad| <= 1e-8，另外限制每個最多 1 秒
+    print("-" * 60)
+    print(f"{'optimizer':14s}{'iters':>8s}{'loss':>12s}{'|q - p|':>12s}{'ms':>9s}  reason")
+    for name, kwargs in [("sgd", dict(lr=0.4, decay=0.8, every=1000)),
+                         ("sgd", dict(lr=2.0)),
+                         ("momentum", dict(lr=0.5, beta=0.8)),
+                         ("adam", dict(lr=0.1)),
+                         ("backtracking", dict(lr=4.0))]:
+        r = minimize(loss_fn, grad_fn, np.zeros(3), optimizer=name, max_iters=20000,
+                     grad_tol=1e-8, time_budget=1.0, **kwargs)
+        err = np.abs(softmax(r["x"]) - p).max()
+        print(f"{name:14s}{r['iterations']:8d}{r['loss']:12.7f}{err:12.2e}{r['seconds'] * 1000:9.1f}  {r['reason']}")
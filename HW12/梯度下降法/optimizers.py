@@ -0,0 +1,166 @@
+import time
+
+import numpy as np
+
+# 梯度下降的各種更新規則，與共用的 minimize() 迴圈。
+# 每個 optimizer 都有 step(x, grad, loss_fn, loss) -> 新的 x，
+# 只有 BacktrackingLineSearch 會用到 loss_fn / loss，其他的忽略即可。
+
+
+class SGD:
+    """
+    固定（或分段衰減）學習率：lr_t = lr * decay ** (t // every)。
+    decay=1 就是固定學習率；原本 Gradient.py 的寫法是 lr=0.4, decay=0.8, every=1000。
+    """
+
+    def __init__(self, lr=0.1, decay=1.0, every=1000):
+        self.lr, self.decay, self.every = lr, decay, every
+        self.t = 0
+        self.last_step = lr
+
+    def step(self, x, grad, loss_fn=None, loss=None):
+        self.last_step = self.lr * (self.decay ** (self.t // self.every))
+        self.t += 1
+        return x - self.last_step * grad
+
+
+class Momentum:
+    """動量法：v = beta*v + grad，x -= lr*v。在狹長的山谷裡比純梯度下降快很多。"""
+
+    def __init__(self, lr=0.1, beta=0.9):
+        self.lr, self.beta = lr, beta
+        self.v = None
+        self.last_step = lr
+
+    def step(self, x, grad, loss_fn=None, loss=None):
+        self.v = grad if self.v is None else self.beta * self.v + grad
+        return x - self.lr * self.v
+
+
+class Adam:
+    """Adam：用梯度的一階、二階動差估計，每個座標各自調整步長。"""
+
+    def __init__(self, lr=0.05, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.lr, self.beta1, self.beta2, self.eps = lr, beta1, beta2, eps
+        self.m = self.v = None
+        self.t = 0
+        self.last_step = lr
+
+    def step(self, x, grad, loss_fn=None, loss=None):
+        if self.m is None:
+            self.m = np.zeros_like(grad)
+            self.v = np.zeros_like(grad)
+        self.t += 1
+        self.m = self.beta1 * self.m + (1 - self.beta1) * grad
+        self.v = self.beta2 * self.v + (1 - self.beta2) * grad * grad
+        m_hat = self.m / (1 - self.beta1 ** self.t)
+        v_hat = self.v / (1 - self.beta2 ** self.t)
+        return x - self.lr * m_hat / (np.sqrt(v_hat) + self.eps)
+
+
+class BacktrackingLineSearch:
+    """
+    回溯線搜尋 (Armijo 條件)：從 lr 開始試，
+    loss(x - a*g) > loss(x) - c*a*|g|² 就把 a 乘上 shrink 再試，直到足夠下降為止。
+    下一輪從上次成功的步長放大 grow 倍開始，不必每次都從頭縮；
+    縮到 min_step 還不行時這一輪不移動，下一輪重新從 lr 開始。
+    """
+
+    def __init__(self, lr=1.0, shrink=0.5, c=1e-4, grow=2.0, min_step=1e-12):
+        if not 0 < shrink < 1:
+            raise ValueError("shrink 必須介於 0 與 1 之間")
+        self.lr, self.shrink, self.c, self.grow, self.min_step = lr, shrink, c, grow, min_step
+        self.last_step = lr
+
+    def step(self, x, grad, loss_fn, loss):
+        g2 = float(np.dot(grad, grad))
+        a = self.last_step
+        while a > self.min_step:
+            x_new = x - a * grad
+            if loss_fn(x_new) <= loss - self.c * a * g2:
+                self.last_step = min(a * self.grow, self.lr)
+                return x_new
+            a *= self.shrink
+        # 這一輪找不到足夠下降的步長：原地不動，但下一輪重新從 lr 開始試，
+        # 不然 last_step 會一直停在 min_step 以下，之後每一輪都直接放棄
+        self.last_step = self.lr
+        return x
+
+
+OPTIMIZERS = {
+    "sgd": SGD,
+    "momentum": Momentum,
+    "adam": Adam,
+    "backtracking": BacktrackingLineSearch,
+}
+
+
+def make_optimizer(name, **kwargs):
+    if name not in OPTIMIZERS:
+        raise ValueError(f"未知的 optimizer: {name}")
+    return OPTIMIZERS[name](**kwargs)
+
+
+def minimize(loss_fn, grad_fn, x0, optimizer="adam", max_iters=20000,
+             grad_tol=1e-6, loss_tol=None, patience=10, time_budget=None,
+             callback=None, trace=None, **optimizer_kwargs):
+    """
+    以梯度下降類的方法最小化 loss_fn。
+
+    參數：
+      loss_fn, grad_fn: loss_fn(x) -> float、grad_fn(x) -> 與 x 同形狀的梯度
+      x0:          初始參數
+      optimizer:   名稱（"sgd"、"momentum"、"adam"、"backtracking"）或已建立好的 optimizer 物件
+      max_iters:   最多迭代次數
+    停止條件（任何一個成立就停）：
+      grad_tol:    梯度的長度 <= grad_tol
+      loss_tol:    連續 patience 輪 loss 的下降量都 < loss_tol（None 代表不檢查）
+      time_budget: 已經跑了這麼多秒（None 代表不限制）
+    callback(t, x, loss, grad_norm, step) 每一輪都會呼叫；
+    trace 是 TraceRecorder，依它的取樣間隔記錄 t、loss、x 與步長。
+
+    回傳 dict：x, loss, iterations（收斂時的迭代次數）, converged（grad_tol 或 loss_tol 才算）, reason, seconds
+    """
+    opt = make_optimizer(optimizer, **optimizer_kwargs) if isinstance(optimizer, str) else optimizer
+    x = np.array(x0, dtype=float)
+    loss = loss_fn(x)
+    start = time.perf_counter()
+    reason = "max_iters"
+    stall = 0
+
+    t = 0
+    for t in range(max_iters):
+        grad = grad_fn(x)
+        grad_norm = float(np.linalg.norm(grad))
+        if callback is not None:
+            callback(t, x, loss, grad_norm, opt.last_step)
+        if trace is not None:
+            trace.record(t, loss, x, opt.last_step)
+        if grad_norm <= grad_tol:
+            reason = "grad_tol"
+            break
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            reason = "time_budget"
+            break
+
+        x = opt.step(x, grad, loss_fn, loss)
+        new_loss = loss_fn(x)
+        if loss_tol is not None:
+            stall = stall + 1 if loss - new_loss < loss_tol else 0
+            if stall >= patience:
+                loss = new_loss
+                t += 1
+                reason = "loss_tol"
+                break
+        loss = new_loss
+    else:
+        t = max_iters
+
+    return {
+        "x": x,
+        "loss": float(loss),
+        "iterations": t,
+        "converged": reason in ("grad_tol", "loss_tol"),   # 時間或迭代次數用完都不算收斂
+        "reason": reason,
+        "seconds": time.perf_counter() - start,
+    }
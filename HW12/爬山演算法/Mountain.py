@@ -1,25 +1,32 @@
+import math
+import os
+import sys
+import time
+
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "HW6"))  # 共用 HW6 的模組
+from multistart import best_so_far, multistart
+from tracer import TraceRecorder, trace_argument_parser
+
 p = np.array([0.5, 0.2, 0.3], dtype=float)
 
 def entropy_bits(p):
     return -np.sum(p * np.log2(p + 1e-12))
 
 target_entropy = entropy_bits(p)
-print(f"Target p: {p}")
-print(f"Target Min Loss (Entropy): {target_entropy:.5f}\n")
 
 def cross_entropy_bits(p, q):
     return -np.sum(p * np.log2(q + 1e-12))
 
-def propose_neighbor(q, step_size):
+def propose_neighbor(q, step_size, rng=np.random):
 
     q_new = q.copy()
     K = len(q_new)
     
-    i, j = np.random.choice(K, size=2, replace=False)
+    i, j = rng.choice(K, size=2, replace=False)
     
-    delta = (np.random.rand() * 2 - 1) * step_size
+    delta = (rng.random() * 2 - 1) * step_size
     
     q_new[i] += delta
     q_new[j] -= delta
@@ -30,39 +37,142 @@ def propose_neighbor(q, step_size):
     q_new = q_new / q_new.sum()
     return q_new
 
-np.random.seed(0)
+def climb(rng, report=None, q0=None, max_iters=20000, base_step=0.2, decay=0.8,
+          check_every=500, trace=None, share_best=False):
+    # rng 可以是 np.random 模組（原本的單一爬山）或多起點時各自的 np.random.Generator
+    # q0 沒給時從隨機的機率分佈出發；report 回傳 True 時提早結束；trace 是 TraceRecorder
+    # share_best=True 時，每次回報後若別條爬山找到更好的 q，就跳到那裡繼續爬
+    q = rng.dirichlet(np.ones(len(p))) if q0 is None else np.asarray(q0, dtype=float)
+    loss = cross_entropy_bits(p, q)
 
-q = np.array([1/3, 1/3, 1/3], dtype=float)
-loss = cross_entropy_bits(p, q)
+    for t in range(max_iters + 1):
+        
+        step_size = base_step * (decay ** (t // 1000))
 
-print("Start Hill Climbing...")
-print(f"Initial q: {q.round(4)}, Loss: {loss:.5f}")
+        if trace is not None:
+            trace.record(t, loss, q, step_size)
+        
+        q_candidate = propose_neighbor(q, step_size, rng)
+        loss_candidate = cross_entropy_bits(p, q_candidate)
+        
+        if loss_candidate < loss:
+            q = q_candidate
+            loss = loss_candidate
 
-max_iters = 20000
-base_step = 0.2   
-decay = 0.8       
+        if report is not None and (t + 1) % check_every == 0:
+            if report(q, loss):
+                break
+            if share_best:
+                shared_loss, shared_q = best_so_far()
+                if shared_loss < loss:
+                    q, loss = shared_q, shared_loss
 
-for t in range(max_iters + 1):
-    
-    if t % 1000 == 0:
-        step_size = base_step * (decay ** (t // 1000))
-        print(f"{t:05d}: Loss={loss:.5f} q={q.round(4)} step={step_size:.5f}")
-    
-    step_size = base_step * (decay ** (t // 1000))
-    
-    q_candidate = propose_neighbor(q, step_size)
-    loss_candidate = cross_entropy_bits(p, q_candidate)
-    
-    if loss_candidate < loss:
-        q = q_candidate
-        loss = loss_candidate
-
-print("-" * 60)
-final_q = q
-final_loss = loss
-
-print("Final Result:")
-print("Optimized q :", final_q.round(4))
-print("Target    p :", p)
-print(f"Final Loss  : {final_loss:.5f}")
-print("Diff (q - p):", final_q - p)
+    return q, float(loss)
+
+def climb_incremental(rng, report=None, p_target=None, q0=None, max_iters=20000, base_step=0.2,
+                      decay=0.8, every=1000, check_every=500, batch=65536, trace=None):
+    """
+    適合 K 很大（例如 10^6 格的直方圖）的爬山，每一輪 O(1)，不複製、不重新正規化 q。
+
+    q 以未正規化的權重 u 表示，q = u / S，S = Σu。loss 可以拆成
+        CE(p, q) = P*log2(S) - Σ p_i*log2(u_i)，P = Σp
+    一次移動只把 δ 從 u_j 搬到 u_i，S 不變，所以 loss 的變化只跟這兩格有關：
+        Δ = -p_i*(log2(u_i+δ) - log2(u_i)) - p_j*(log2(u_j-δ) - log2(u_j))
+    δ 取 ±step * min(u_i, u_j) 之間的亂數（相對大小，權重永遠保持正的，
+    q 的各格大小差很多時也適用）；i, j 與 δ 的亂數一次抽一整批，減少呼叫 NumPy 的次數。
+    p_target 是要逼近的分佈（預設是 p）；回傳 (正規化後的 q, loss)。
+    迴圈中只用 report(None, loss) 回報 loss（O(1)），結束時才把完整的 q 回報一次。
+    trace 是 TraceRecorder（K 很大時請用 record_params=False，只記 loss 與步長）。
+    """
+    p_vec = p if p_target is None else np.asarray(p_target, dtype=float)
+    K = len(p_vec)
+    if K < 2:
+        raise ValueError("至少要有兩格才能搬移")
+    u = np.full(K, 1.0 / K) if q0 is None else np.array(q0, dtype=float)
+    if np.any(u <= 0):
+        raise ValueError("q0 的每一格都必須大於 0")
+    total = float(u.sum())
+    P = float(p_vec.sum())
+    loss = P * math.log2(total) - float(p_vec @ np.log2(u))   # 之後只用兩格的變化增量更新
+
+    def finish():
+        q = u / total
+        if report is not None:
+            report(q, loss)
+        return q, float(loss)
+
+    log2 = math.log2
+    for t0 in range(0, max_iters + 1, batch):
+        n = min(batch, max_iters + 1 - t0)
+        I = rng.integers(0, K, n)
+        J = rng.integers(0, K - 1, n)
+        J += J >= I                                     # 保證 j != i
+        R = rng.random(n) * 2 - 1
+        for t, i, j, r in zip(range(t0, t0 + n), I.tolist(), J.tolist(), R.tolist()):
+            step_size = base_step * (decay ** (t // every))
+            if trace is not None and t % trace.every == 0:
+                trace.record(t, loss, u / total if trace.record_params else None, step_size)
+            ui, uj = u[i], u[j]
+            delta = r * step_size * (ui if ui < uj else uj)
+            pi, pj = p_vec[i], p_vec[j]
+            gain = pi * (log2(ui + delta) - log2(ui)) + pj * (log2(uj - delta) - log2(uj))
+            if gain > 0:                                # loss 下降 gain
+                u[i] = ui + delta
+                u[j] = uj - delta
+                loss -= gain
+            if report is not None and (t + 1) % check_every == 0 and report(None, loss):
+                return finish()
+
+    return finish()
+
+if __name__ == "__main__":
+    TRACE_PATH = trace_argument_parser().parse_args().trace
+    print(f"Target p: {p}")
+    print(f"Target Min Loss (Entropy): {target_entropy:.5f}\n")
+
+    np.random.seed(0)
+
+    print("Start Hill Climbing...")
+    print(f"Initial q: {np.full(3, 1/3).round(4)}, Loss: {cross_entropy_bits(p, np.full(3, 1/3)):.5f}")
+
+    trace = TraceRecorder(every=1000)
+    final_q, final_loss = climb(np.random, q0=[1/3, 1/3, 1/3], trace=trace)
+    trace.print_summary(fmt=lambda r: f"{int(r[0]):05d}: Loss={r[1]:.5f} "
+                                      f"q={r[4:].round(4)} step={r[2]:.5f}")
+    if TRACE_PATH:
+        trace.save(TRACE_PATH)
+
+    print("-" * 60)
+
+    print("Final Result:")
+    print("Optimized q :", final_q.round(4))
+    print("Target    p :", p)
+    print(f"Final Loss  : {final_loss:.5f}")
+    print("Diff (q - p):", final_q - p)
+
+    # 多起點：8 條爬山各自從隨機的 q 出發平行跑，彼此共享目前最好的 q，
+    # loss 離熵不到 1e-6 就全部停止
+    best_q, best_loss, losses = multistart(climb, 8, dim=len(p), seed=0,
+                                           target=target_entropy + 1e-6, share_best=True)
+    print("-" * 60)
+    print("Multi-start Result:")
+    print("Losses      :", [round(l, 6) for l in losses])
+    print("Optimized q :", best_q.round(4))
+    print(f"Final Loss  : {best_loss:.5f}")
+
+    # 大 K：一百萬格的直方圖，每一輪只動兩格，O(1)
+    K = 1_000_000
+    rng = np.random.default_rng(0)
+    hist = rng.poisson(5.0, K) + 1.0
+    big_p = hist / hist.sum()
+    start = time.perf_counter()
+    big_trace = TraceRecorder(every=100_000, record_params=False)
+    big_q, big_loss = climb_incremental(rng, p_target=big_p, max_iters=2_000_000,
+                                        base_step=0.5, every=100_000, trace=big_trace)
+    seconds = time.perf_counter() - start
+    uniform_loss = cross_entropy_bits(big_p, np.full(K, 1.0 / K))
+    print("-" * 60)
+    print(f"Incremental hill climbing, K = {K:,}: 2,000,000 iters in {seconds:.2f}s")
+    print(f"Loss: {uniform_loss:.5f} (uniform) -> {big_loss:.5f}, entropy {entropy_bits(big_p):.5f}")
+    print(f"Check (recomputed): {cross_entropy_bits(big_p, big_q):.5f}")
+    big_trace.print_summary(every=500_000)
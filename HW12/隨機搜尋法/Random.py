@@ -1,35 +1,95 @@
+import os
+import sys
+import time
+
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "HW6"))  # 共用 HW6 的模組
+from tracer import TraceRecorder, trace_argument_parser
+
 p = np.array([0.5, 0.2, 0.3])
 
 def cross_entropy_bits(p, q):
     return -np.sum(p * np.log2(q + 1e-12))
 
-print("Random Search for CE(p,q) minimum")
-print("Target p:", p)
-print()
+def batch_cross_entropy_bits(p, Q):
+    # Q 的每一列是一個候選分佈，一次矩陣乘法算出整批的交叉熵
+    return -(np.log2(Q + 1e-12) @ p)
+
+def random_search(p, batch_size=100_000, max_evals=None, time_budget=None, seed=None,
+                  trace=None):
+    """
+    批次隨機搜尋：每次抽 batch_size 個候選分佈、整批算 loss，只保留目前最好的一個。
+    Dirichlet(1, ..., 1) 等於把 K 個指數分佈亂數除以總和，一次就能抽一整批。
 
-best_q = np.random.dirichlet(alpha=np.ones(3))
-best_loss = cross_entropy_bits(p, best_q)
+    停止條件：評估次數達到 max_evals，或已經跑了 time_budget 秒（至少要給一個）。
+    trace 是 TraceRecorder，每一批記一筆（iteration 為累計評估次數）。
+    回傳 (best_q, best_loss, 評估次數, 秒數)
+    """
+    if max_evals is None and time_budget is None:
+        raise ValueError("max_evals 與 time_budget 至少要指定一個")
+    rng = np.random.default_rng(seed)
+    K = len(p)
+    best_q, best_loss = None, np.inf
+    evals = 0
+    start = time.perf_counter()
 
-print(f"Initial q: {best_q.round(4)}, Loss: {best_loss:.5f}")
+    while True:
+        n = batch_size if max_evals is None else min(batch_size, max_evals - evals)
+        if n <= 0:
+            break
+        Q = rng.standard_exponential((n, K))
+        Q /= Q.sum(axis=1, keepdims=True)
+        losses = batch_cross_entropy_bits(p, Q)
+        k = int(np.argmin(losses))
+        evals += n
+        if losses[k] < best_loss:
+            best_q, best_loss = Q[k].copy(), float(losses[k])
+        if trace is not None:
+            trace.record(evals, best_loss, best_q)
 
-max_iters = 20000
+        elapsed = time.perf_counter() - start
+        if time_budget is not None and elapsed >= time_budget:
+            break
+    return best_q, best_loss, evals, time.perf_counter() - start
 
-for t in range(max_iters + 1):
-    q_candidate = np.random.dirichlet(alpha=np.ones(3))
-    loss_candidate = cross_entropy_bits(p, q_candidate)
+if __name__ == "__main__":
+    TRACE_PATH = trace_argument_parser().parse_args().trace
+    print("Random Search for CE(p,q) minimum")
+    print("Target p:", p)
+    print()
 
-    if loss_candidate < best_loss:
-        best_q = q_candidate
-        best_loss = loss_candidate
+    # 原本的做法：每一輪抽一個候選、算一次 loss，用來比較速度
+    best_q = np.random.dirichlet(alpha=np.ones(3))
+    best_loss = cross_entropy_bits(p, best_q)
+    max_iters = 20000
+    start = time.perf_counter()
+    for t in range(max_iters + 1):
+        q_candidate = np.random.dirichlet(alpha=np.ones(3))
+        loss_candidate = cross_entropy_bits(p, q_candidate)
+        if loss_candidate < best_loss:
+            best_q = q_candidate
+            best_loss = loss_candidate
+    loop_rate = (max_iters + 1) / (time.perf_counter() - start)
+    print(f"逐一評估：{max_iters + 1} 個候選，Loss={best_loss:.7f}，每秒 {loop_rate:,.0f} 個")
 
-    if t % 1000 == 0:
-        print(f"{t:05d}: Loss={best_loss:.5f} q={best_q.round(4)}")
+    # 批次評估：同樣的時間預算 1 秒
+    print()
+    trace = TraceRecorder()
+    best_q, best_loss, evals, seconds = random_search(p, time_budget=1.0, seed=0, trace=trace)
+    # 只印 loss 有改善的那幾批
+    rows = trace.to_array()
+    for k, row in enumerate(rows):
+        if k == 0 or row[1] < rows[k - 1][1]:
+            print(f"{int(row[0]):>11,d}: Loss={row[1]:.7f} q={row[4:].round(4)}")
+    if TRACE_PATH:
+        trace.save(TRACE_PATH)
+    batch_rate = evals / seconds
+    print(f"批次評估：{evals:,} 個候選，每秒 {batch_rate:,.0f} 個（{batch_rate / loop_rate:.0f} 倍）")
 
-print("-" * 60)
-print("Final Result:")
-print("Optimized q :", best_q.round(4))
-print("Target    p :", p)
-print("Final Loss  :", best_loss)
-print("Diff (q - p):", best_q - p)
+    print("-" * 60)
+    print("Final Result:")
+    print("Optimized q :", best_q.round(4))
+    print("Target    p :", p)
+    print("Final Loss  :", best_loss)
+    print("Diff (q - p):", best_q - p)
@@ -0,0 +1,181 @@
+import atexit
+import functools
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class _LRUStore:
+    """最近最少使用 (LRU)：滿了就丟掉最久沒被用到的項目。"""
+
+    def __init__(self):
+        self.data = OrderedDict()
+
+    def get(self, key):
+        value = self.data[key]          # 不存在時丟出 KeyError
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+
+    def evict(self):
+        self.data.popitem(last=False)
+
+    def items(self):
+        return list(self.data.items())
+
+
+class _LFUStore:
+    """
+    最不常使用 (LFU)：滿了就丟掉被用到次數最少的項目（同次數時丟最舊的）。
+    依使用次數分桶，每個桶是一個 OrderedDict，取用與淘汰都是 O(1)。
+    """
+
+    def __init__(self):
+        self.data = {}                  # key -> (value, freq)
+        self.buckets = {}               # freq -> OrderedDict[key, None]
+        self.min_freq = 0
+
+    def _touch(self, key, freq):
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        value, freq = self.data[key]
+        self._touch(key, freq)
+        self.data[key] = (value, freq + 1)
+        return value
+
+    def put(self, key, value):
+        if key in self.data:
+            _, freq = self.data[key]
+            self._touch(key, freq)
+            self.data[key] = (value, freq + 1)
+            return
+        self.data[key] = (value, 1)
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_freq = 1
+
+    def evict(self):
+        bucket = self.buckets[self.min_freq]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_freq]
+        del self.data[key]
+        if self.buckets and self.min_freq not in self.buckets:
+            self.min_freq = min(self.buckets)
+
+    def items(self):
+        return [(k, v) for k, (v, _) in self.data.items()]
+
+
+# 位置參數與關鍵字參數之間的分隔記號（用字串，存檔後重新載入也能比對）
+_KWARGS_MARK = "<memo-kwargs>"
+
+
+def _make_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+def memoize(maxsize=128, policy="lru", path=None):
+    """
+    記憶化 (memoization) 裝飾器，可以直接套在遞迴函式上：
+
+        @memoize(maxsize=1024)
+        def fib(n):
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    參數：
+      maxsize: 最多記住幾個結果，None 代表不限制
+      policy:  滿了時要丟掉誰，"lru"（最久沒用）或 "lfu"（最少用）
+      path:    指定檔案時，啟動會先從檔案載入快取，程式結束時自動存回去
+               （參數與結果都必須可以 pickle）
+
+    多個 thread 同時呼叫是安全的：只有讀寫快取時才上鎖，
+    計算本身不在鎖裡，遞迴呼叫與其他 thread 都不會被卡住。
+    被裝飾的函式多了這些方法：
+      cache_info()  回傳 {"hits", "misses", "evictions", "size", "maxsize", "hit_rate"}
+      cache_clear() 清空快取與計數
+      cached(*args) 這組參數是否已在快取中（不影響計數與淘汰順序）
+      save()        立刻把快取存到 path
+    """
+    if policy not in ("lru", "lfu"):
+        raise ValueError(f"未知的 policy: {policy}")
+    if maxsize is not None and maxsize <= 0:
+        raise ValueError("maxsize 必須是正整數或 None")
+
+    def decorator(func):
+        lock = threading.RLock()
+        store = _LRUStore() if policy == "lru" else _LFUStore()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        def put(key, value):
+            if key not in store.data and maxsize is not None and len(store.data) >= maxsize:
+                store.evict()
+                stats["evictions"] += 1
+            store.put(key, value)
+
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as fp:
+                for key, value in pickle.load(fp):
+                    put(key, value)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with lock:
+                try:
+                    value = store.get(key)
+                    stats["hits"] += 1
+                    return value
+                except KeyError:
+                    stats["misses"] += 1
+            value = func(*args, **kwargs)
+            with lock:
+                put(key, value)
+            return value
+
+        def cache_info():
+            with lock:
+                total = stats["hits"] + stats["misses"]
+                return dict(stats, size=len(store.data), maxsize=maxsize,
+                            hit_rate=stats["hits"] / total if total else 0.0)
+
+        def cache_clear():
+            nonlocal store
+            with lock:
+                store = _LRUStore() if policy == "lru" else _LFUStore()
+                for name in stats:
+                    stats[name] = 0
+
+        def cached(*args, **kwargs):
+            with lock:
+                return _make_key(args, kwargs) in store.data
+
+        def save():
+            if path is None:
+                raise ValueError("沒有指定 path，無法存檔")
+            with lock:
+                items = store.items()
+            with open(path, "wb") as fp:
+                pickle.dump(items, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.cached = cached
+        wrapper.save = save
+        if path is not None:
+            atexit.register(save)
+        return wrapper
+
+    return decorator
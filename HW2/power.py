@@ -0,0 +1,118 @@
+import time
+
+from power2n import _power2n_3, power2n_1, power2n_2a, power2n_2b, power2n_3
+
+
+def power(base, n):
+    """
+    反覆平方法 (exponentiation by squaring)，迭代版本。
+    把 n 寫成二進位，每一位只需要一次平方、最多一次乘法，
+    總共 O(log n) 次乘法，不用遞迴，n 再大也不會超過遞迴深度。
+    base 可以是 int、float 或任何支援 * 的物件（例如矩陣）。
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("n 必須是非負整數")
+    result = 1
+    while n > 0:
+        if n & 1:
+            result = result * base
+        n >>= 1
+        if n:
+            base = base * base
+    return result
+
+
+def power_mod(base, n, mod):
+    """
+    計算 base^n mod mod，每一步都先取餘數，數字不會越算越大。
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("n 必須是非負整數")
+    if mod <= 0:
+        raise ValueError("mod 必須是正整數")
+    result = 1 % mod
+    base %= mod
+    while n > 0:
+        if n & 1:
+            result = result * base % mod
+        n >>= 1
+        if n:
+            base = base * base % mod
+    return result
+
+
+def power_many(base, exponents, mod=None):
+    """
+    一次算出一整批指數的 base^e（或 base^e mod mod），回傳順序和 exponents 相同。
+
+    先把指數由小到大排序，之後每一個只要在前一個結果上乘 base^(差距)，
+    相同的差距只算一次，所以一次掃過就能算完，不必每個指數都從頭做反覆平方。
+    """
+    exponents = list(exponents)
+    for e in exponents:
+        if not isinstance(e, int) or e < 0:
+            raise ValueError("指數必須是非負整數")
+    if mod is not None and mod <= 0:
+        raise ValueError("mod 必須是正整數")
+
+    step_cache = {}
+
+    def step(delta):
+        if delta not in step_cache:
+            step_cache[delta] = power(base, delta) if mod is None else power_mod(base, delta, mod)
+        return step_cache[delta]
+
+    results = {}
+    current, prev = (1 if mod is None else 1 % mod), 0
+    for e in sorted(set(exponents)):
+        if e > prev:
+            current = current * step(e - prev)
+            if mod is not None:
+                current %= mod
+        results[e] = current
+        prev = e
+    return [results[e] for e in exponents]
+
+
+def _time(f, *args, repeat=3, setup=None):
+    # 取 repeat 次中最快的一次；setup 在每次計時前呼叫（不計時），例如清空快取
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        f(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    for i in range(0, 11):
+        print(i, power(2, i), power_mod(2, i, 1000), power2n_3(i))
+
+    # ===== 各種方法的時間隨 n 成長的情形 =====
+    # power2n_2a 是 O(2^n)，power2n_2b 遞迴深度 n；
+    # power2n_3 第一次算到 n 要做 n 次越來越大的整數加法（共約 n^2 / 2 bits）。太大的 n 就跳過；
+    # 之後再算同一個 n 只是查表，所以每次計時前先清空快取，量到的才是從頭算的時間
+    strategies = [
+        ("2 ** n", power2n_1, lambda n: True, None),
+        ("遞迴 2a O(2^n)", power2n_2a, lambda n: n <= 20, None),
+        ("遞迴 2b O(n)", power2n_2b, lambda n: n <= 900, None),
+        ("查表 power2n_3", power2n_3, lambda n: n <= 10_000, _power2n_3.cache_clear),
+        ("反覆平方 power", lambda n: power(2, n), lambda n: True, None),
+        ("power_mod", lambda n: power_mod(2, n, 10 ** 9 + 7), lambda n: True, None),
+    ]
+    sizes = [10, 20, 500, 10_000, 1_000_000]
+
+    print("\n" + f"{'方法':16s}" + "".join(f"{'n=' + str(n):>14s}" for n in sizes))
+    for name, f, ok, setup in strategies:
+        row = f"{name:16s}"
+        for n in sizes:
+            row += f"{_time(f, n, setup=setup) * 1e6:12.1f}us" if ok(n) else f"{'-':>14s}"
+        print(row)
+
+    exps = list(range(0, 20_000, 7))
+    t_loop = _time(lambda: [power_mod(3, e, 10 ** 9 + 7) for e in exps])
+    t_bulk = _time(lambda: power_many(3, exps, mod=10 ** 9 + 7))
+    print(f"\n{len(exps)} 個指數的 3^e mod p：逐一 power_mod {t_loop * 1e3:.2f} ms，"
+          f"power_many {t_bulk * 1e3:.2f} ms")
@@ -1,3 +1,5 @@
+from memo import memoize
+
 # 方法 1
 def power2n_1(n):
     return 2 ** n
@@ -14,15 +16,23 @@ def power2n_2b(n):
         return 1
     return 2 * power2n_2b(n-1)
 
-# 方法 3：用遞迴 + 查表
-p2Table = [-1] * 101
-p2Table[0] = 1
+# 方法 3：用遞迴 + 查表（查表交給 memo.memoize，最多記住最近 1024 個結果）
+@memoize(maxsize=1024)
+def _power2n_3(n):
+    if n == 0:
+        return 1
+    return _power2n_3(n-1) + _power2n_3(n-1)   # 第二次呼叫一定查表命中
 
 def power2n_3(n):
-    if p2Table[n] != -1:
-        return p2Table[n]
-    p2Table[n] = power2n_3(n-1) + power2n_3(n-1)
-    return p2Table[n]
+    if n < 0:
+        raise ValueError("n 必須是非負整數")
+    # 從最大的已知結果往上補，每次遞迴最多只深入一層，n 再大也不會超過遞迴深度
+    k = n
+    while k > 0 and not _power2n_3.cached(k-1):
+        k -= 1
+    for j in range(k, n):
+        _power2n_3(j)
+    return _power2n_3(n)
 
 if __name__ == "__main__":
     for i in range(0, 11):
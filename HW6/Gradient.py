@@ -1,18 +1,20 @@
 import random
 
+from linreg import LinearRegressionMSE, make_data
+from tracer import TraceRecorder, trace_argument_parser
+
 # ===== 1. 產生假資料： y = 2x + 1 + noise =====
 random.seed(0)
-X = [i for i in range(20)]
-Y = [2.0 * x + 1.0 + random.uniform(-1.0, 1.0) for x in X]
-N = len(X)
+parser = trace_argument_parser()
+parser.add_argument("n", nargs="?", type=int, default=20, help="資料筆數")
+args = parser.parse_args()
+N = args.n
+TRACE_PATH = args.trace
+X, Y = make_data(N)
 
 # ===== 2. 定義成本函數 (MSE)，方便觀察收斂 =====
-def cost(w, b):
-    s = 0.0
-    for x, y in zip(X, Y):
-        y_pred = w * x + b
-        s += (y - y_pred) ** 2
-    return s / N
+objective = LinearRegressionMSE(X, Y)
+cost = objective.cost
 
 # ===== 3. 梯度下降法 =====
 
@@ -21,29 +23,27 @@ w = 0.0
 b = 0.0
 
 alpha = 0.0005     # 學習率，可以調整
+# 資料的 x 越大，梯度變化越劇烈；學習率超過 1/L 會發散，所以最多取 1/L
+alpha = min(alpha, 1.0 / objective.lipschitz())
 max_iter = 20000
+trace = TraceRecorder(every=2000)
 
 for it in range(max_iter):
-    # 計算梯度 (對 w, b 的偏導)
-    dJ_dw = 0.0
-    dJ_db = 0.0
-
-    for x, y in zip(X, Y):
-        y_pred = w * x + b
-        e = y - y_pred
-        dJ_dw += -2 * x * e
-        dJ_db += -2 * e
-
-    dJ_dw /= N
-    dJ_db /= N
+    # 計算梯度 (對 w, b 的偏導)，同樣只用預先算好的和，O(1)
+    dJ_dw, dJ_db = objective.gradient(w, b)
 
     # 更新參數
     w = w - alpha * dJ_dw
     b = b - alpha * dJ_db
 
-    # 每隔一段時間印一次 cost 看收斂狀況
-    if (it + 1) % 2000 == 0:
-        print(f"iter {it+1}, cost = {cost(w, b):.4f}, w = {w:.4f}, b = {b:.4f}")
+    # 每隔 2000 輪記下 cost 與參數，跑完再看收斂狀況
+    if (it + 1) % trace.every == 0:
+        trace.record(it + 1, cost(w, b), (w, b), alpha)
+
+trace.print_summary(fmt=lambda r: f"iter {int(r[0])}, cost = {r[1]:.4f}, "
+                                  f"w = {r[4]:.4f}, b = {r[5]:.4f}")
+if TRACE_PATH:
+    trace.save(TRACE_PATH)
 
 print("\n最終結果：")
 print("w =", w)
@@ -1,18 +1,20 @@
 import random
 
+from linreg import LinearRegressionMSE, make_data
+from local_search import local_search
+from tracer import TraceRecorder, trace_argument_parser
+
 # ===== 1. 產生一組假資料： y = 2x + 1 + noise =====
 random.seed(0)
-X = [i for i in range(20)]
-Y = [2.0 * x + 1.0 + random.uniform(-1.0, 1.0) for x in X]
-N = len(X)
+parser = trace_argument_parser()
+parser.add_argument("n", nargs="?", type=int, default=20, help="資料筆數")
+args = parser.parse_args()
+N = args.n
+TRACE_PATH = args.trace
+X, Y = make_data(N)
 
 # ===== 2. 定義成本函數 (MSE) =====
-def cost(w, b):
-    s = 0.0
-    for x, y in zip(X, Y):
-        y_pred = w * x + b
-        s += (y - y_pred) ** 2
-    return s / N
+objective = LinearRegressionMSE(X, Y)
 
 # ===== 3. 改良法 (local improvement) 解線性迴歸 =====
 
@@ -25,41 +27,19 @@ step_b = 0.1
 
 min_step = 1e-6
 max_iter = 10000
+trace = TraceRecorder(capacity=max_iter)   # 每一輪的 cost 與參數
 
-best_cost = cost(w, b)
-
-for it in range(max_iter):
-    improved = False
-    best_local_w = w
-    best_local_b = b
-    best_local_cost = best_cost
-
-    # 掃描 3x3 鄰域：k, l in {-1, 0, 1}
-    for k in [-1, 0, 1]:
-        for l in [-1, 0, 1]:
-            w_cand = w + k * step_w
-            b_cand = b + l * step_b
-            c = cost(w_cand, b_cand)
-
-            if c < best_local_cost:
-                best_local_cost = c
-                best_local_w = w_cand
-                best_local_b = b_cand
-                improved = True
-
-    if improved:
-        # 有更好的鄰居 → 做改良
-        w, b = best_local_w, best_local_b
-        best_cost = best_local_cost
-    else:
-        # 鄰域內沒有更好的 → 縮小步長
-        step_w *= 0.5
-        step_b *= 0.5
-        if step_w < min_step and step_b < min_step:
-            # 步長太小，視為收斂
-            break
+# 每一輪掃描 3x3 鄰域 (w + k*step_w, b + l*step_b)，k, l in {-1, 0, 1}，整批一次算 cost；
+# 有更好的鄰居就做改良，否則縮小步長，兩個步長都太小時視為收斂
+(w, b), best_cost, _ = local_search(objective.batch_cost, [w, b], step=[step_w, step_b],
+                                   neighborhood="grid", shrink=0.5,
+                                   min_step=min_step, max_iter=max_iter, trace=trace)
+w, b = float(w), float(b)
 
 print("改良法找到的參數：")
 print("w =", w)
 print("b =", b)
 print("最終 MSE =", best_cost)
+
+if TRACE_PATH:
+    trace.save(TRACE_PATH)
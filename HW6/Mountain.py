@@ -1,47 +1,88 @@
 import random
-import math
+
+from linreg import LinearRegressionMSE, make_data
+from multistart import best_so_far, multistart
+from tracer import TraceRecorder, trace_argument_parser
 
 # 1. 建資料：y = 2x + 1 + noise
-random.seed(42)
-X = [i for i in range(20)]
-Y = [2.0 * x + 1.0 + random.uniform(-1.0, 1.0) for x in X]
-N = len(X)
-
-# 2. 定義 cost 函數 (MSE)
-def cost(w, b):
-    s = 0.0
-    for x, y in zip(X, Y):
-        y_pred = w * x + b
-        s += (y - y_pred) ** 2
-    return s / N
+def build_objective(n=20):
+    """固定亂數種子產生 n 筆資料，回傳它的 MSE 物件。"""
+    random.seed(42)
+    X, Y = make_data(n)
+    return LinearRegressionMSE(X, Y)
+
+# 2. 定義 cost 函數 (MSE)；直接執行時資料筆數可以從命令列指定
+objective = build_objective()
+cost = objective.cost
 
 # 3. 爬山演算法 (其實在 "往 cost 更低的方向走")
-# 初始化
-w = random.uniform(-1, 1)
-b = random.uniform(-1, 1)
-best_cost = cost(w, b)
-
-step = 0.05       # 鄰居擾動的範圍
-max_iter = 10000
-
-for it in range(max_iter):
-    # 產生鄰居解
-    dw = random.uniform(-step, step)
-    db = random.uniform(-step, step)
-    w_new = w + dw
-    b_new = b + db
-
-    new_cost = cost(w_new, b_new)
-
-    # 若比較好就接受
-    if new_cost < best_cost:
-        w = w_new
-        b = b_new
-        best_cost = new_cost
-
-    # 也可以每隔一段時間縮小 step，讓搜尋更細緻
-    if (it+1) % 2000 == 0:
-        step *= 0.5  # 降低步長
-
-print("找到的 w, b:", w, b)
-print("最終 MSE:", best_cost)
+def climb(rng, report=None, step=0.05, max_iter=10000, check_every=200, trace=None,
+          share_best=False, objective=None):
+    """
+    從 rng 抽一個隨機起點開始爬山，回傳 ((w, b), cost)。
+    rng 只要有 uniform(a, b) 就可以：傳 random 模組就是原本的單一爬山，
+    多起點時每一條會拿到自己的 np.random.Generator。
+    report 是 multistart 給的回報函式，回傳 True 時提早結束；trace 是 TraceRecorder。
+    share_best=True 時，每次回報後若別條爬山找到更好的解，就跳到那裡繼續爬
+    （之後的擾動仍用自己的亂數，等於從目前最好的解往不同方向多試幾條）。
+    objective 是要最小化的 LinearRegressionMSE，沒給時用模組裡預設的 20 筆資料。
+    """
+    cost_fn = cost if objective is None else objective.cost
+    # 初始化
+    w = rng.uniform(-1, 1)
+    b = rng.uniform(-1, 1)
+    best_cost = cost_fn(w, b)
+
+    for it in range(max_iter):
+        # 產生鄰居解
+        dw = rng.uniform(-step, step)
+        db = rng.uniform(-step, step)
+        w_new = w + dw
+        b_new = b + db
+
+        new_cost = cost_fn(w_new, b_new)
+
+        # 若比較好就接受
+        if new_cost < best_cost:
+            w = w_new
+            b = b_new
+            best_cost = new_cost
+
+        # 也可以每隔一段時間縮小 step，讓搜尋更細緻
+        if (it+1) % 2000 == 0:
+            step *= 0.5  # 降低步長
+
+        if trace is not None:
+            trace.record(it + 1, best_cost, (w, b), step)
+        if report is not None and (it + 1) % check_every == 0:
+            if report((w, b), best_cost):
+                break
+            if share_best:
+                shared_cost, shared_x = best_so_far()
+                if shared_cost < best_cost:
+                    (w, b), best_cost = shared_x, shared_cost
+
+    return (float(w), float(b)), float(best_cost)
+
+
+if __name__ == "__main__":
+    parser = trace_argument_parser()
+    parser.add_argument("n", nargs="?", type=int, default=20, help="資料筆數")
+    args = parser.parse_args()
+    objective = build_objective(args.n)
+
+    trace = TraceRecorder(every=100)
+    (w, b), best_cost = climb(random, trace=trace, objective=objective)
+    if args.trace:
+        trace.save(args.trace)
+    print("找到的 w, b:", w, b)
+    print("最終 MSE:", best_cost)
+
+    # 4. 多起點爬山：8 條爬山平行跑，彼此共享目前最好的解，
+    #    任何一條的 MSE 離最佳解不到 0.1% 就全部停止
+    target = objective.cost(*objective.solve()) * 1.001
+    (w, b), best_cost, losses = multistart(climb, 8, dim=2, seed=42, target=target,
+                                           share_best=True, objective=objective)
+    print("\n多起點爬山：各條的 MSE", [round(c, 5) for c in losses])
+    print("找到的 w, b:", w, b)
+    print("最終 MSE:", best_cost)
@@ -0,0 +1,116 @@
+import random
+
+import numpy as np
+
+# 線性迴歸 y ≈ w*x + b 的成本函數 (MSE) 與梯度。
+#
+# MSE(w, b) = (1/N) Σ (y - w*x - b)^2 展開後只用得到 Σx、Σx²、Σy、Σxy、Σy²，
+# 建構時掃過資料一次把這些和算好，之後每次算 cost / gradient 都是 O(1)，跟 N 無關。
+# 為了避免 N 很大時「大數相減」的誤差，實際存的是以平均值為中心的和：
+#   Sxx = Σ(x-x̄)²、Sxy = Σ(x-x̄)(y-ȳ)、Syy = Σ(y-ȳ)²
+# 令 c = ȳ - w*x̄ - b，交叉項剛好為 0，於是
+#   MSE     = (Syy - 2w*Sxy + w²*Sxx) / N + c²
+#   ∂J/∂w   = -2 * (x̄*c + (Sxy - w*Sxx) / N)
+#   ∂J/∂b   = -2 * c
+
+
+class LinearRegressionMSE:
+    def __init__(self, X, Y):
+        x = np.asarray(X, dtype=np.float64)
+        y = np.asarray(Y, dtype=np.float64)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("X 與 Y 必須是長度相同的一維資料")
+        if x.size == 0:
+            raise ValueError("資料不可為空")
+        self.n = x.size
+        self.mean_x = float(x.mean())
+        self.mean_y = float(y.mean())
+        xc = x - self.mean_x
+        yc = y - self.mean_y
+        self.sxx = float(xc @ xc)
+        self.sxy = float(xc @ yc)
+        self.syy = float(yc @ yc)
+
+    def cost(self, w, b):
+        c = self.mean_y - w * self.mean_x - b
+        return (self.syy - 2 * w * self.sxy + w * w * self.sxx) / self.n + c * c
+
+    def batch_cost(self, params):
+        """params: m×2 的 [w, b] 陣列，一次算出 m 組參數的 MSE。"""
+        params = np.asarray(params, dtype=np.float64)
+        w, b = params[:, 0], params[:, 1]
+        c = self.mean_y - w * self.mean_x - b
+        return (self.syy - 2 * w * self.sxy + w * w * self.sxx) / self.n + c * c
+
+    def gradient(self, w, b):
+        """回傳 (∂J/∂w, ∂J/∂b)"""
+        c = self.mean_y - w * self.mean_x - b
+        dJ_dw = -2 * (self.mean_x * c + (self.sxy - w * self.sxx) / self.n)
+        dJ_db = -2 * c
+        return dJ_dw, dJ_db
+
+    def lipschitz(self):
+        """
+        梯度的 Lipschitz 常數 L（Hessian 2*[[E[x²], x̄], [x̄, 1]] 的最大特徵值）。
+        梯度下降的學習率不超過 1/L 就保證不會發散。
+        """
+        exx = self.sxx / self.n + self.mean_x ** 2
+        tr = exx + 1.0
+        det = exx - self.mean_x ** 2
+        return tr + np.sqrt(max(tr * tr - 4 * det, 0.0))
+
+    def solve(self):
+        """最小平方法的解析解 (w, b)，可以拿來檢查各種搜尋法找到的答案。"""
+        w = self.sxy / self.sxx if self.sxx else 0.0
+        return w, self.mean_y - w * self.mean_x
+
+
+def make_data(n=20, w=2.0, b=1.0, noise=1.0, x_max=19.0):
+    """
+    產生假資料 y = w*x + b + noise，x 在 [0, x_max] 上等距取 n 個點。
+    不論 n 多大 x 的範圍都固定，問題的條件數不變，各種搜尋法的步長設定都還適用。
+    使用全域的 random（呼叫前先 random.seed），n=20 時 x = 0, 1, ..., 19，與原本各程式的資料完全相同。
+    """
+    X = [x_max * i / (n - 1) for i in range(n)] if n > 1 else [0.0]
+    Y = [w * x + b + random.uniform(-noise, noise) for x in X]
+    return X, Y
+
+
+class LeastSquaresMSE:
+    """
+    一般的線性模型 y ≈ Φθ（Φ 是 N×d 的特徵矩陣，θ 是 d 維參數）的 MSE。
+
+    同樣先把資料濃縮成 G = ΦᵀΦ/N、h = Φᵀy/N、yy = yᵀy/N，
+      MSE(θ) = yy - 2 θ·h + θᵀGθ
+    batch_cost 一次評估 m 個候選參數（m×d 的矩陣），只需要一次矩陣乘法，成本 O(m d²)，跟 N 無關。
+    """
+
+    def __init__(self, features, y):
+        phi = np.asarray(features, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if phi.ndim != 2 or y.shape != (phi.shape[0],):
+            raise ValueError("features 必須是 N×d 矩陣，y 必須是長度 N 的向量")
+        if phi.shape[0] == 0:
+            raise ValueError("資料不可為空")
+        self.n, self.dim = phi.shape
+        self.gram = phi.T @ phi / self.n
+        self.h = phi.T @ y / self.n
+        self.yy = float(y @ y) / self.n
+
+    def cost(self, theta):
+        theta = np.asarray(theta, dtype=np.float64)
+        return float(self.yy - 2 * theta @ self.h + theta @ self.gram @ theta)
+
+    def batch_cost(self, thetas):
+        """thetas: m×d，回傳長度 m 的 MSE 陣列"""
+        thetas = np.asarray(thetas, dtype=np.float64)
+        return self.yy - 2 * thetas @ self.h + np.einsum("ij,ij->i", thetas @ self.gram, thetas)
+
+    def solve(self):
+        return np.linalg.lstsq(self.gram, self.h, rcond=None)[0]
+
+
+def polynomial_features(X, degree):
+    """[1, x, x², ..., x^degree]，把多項式迴歸變成線性模型。"""
+    x = np.asarray(X, dtype=np.float64)
+    return np.vander(x, degree + 1, increasing=True)
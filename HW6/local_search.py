@@ -0,0 +1,101 @@
+import itertools
+
+import numpy as np
+
+# 批次鄰域的局部搜尋：每一輪把所有鄰居一次排成一個 m×d 的 NumPy 陣列，
+# 交給 batch_cost 一次算完，再用 argmin 挑最好的，不必在 Python 迴圈裡一個一個呼叫 cost。
+# 適用於任意 d 維參數向量。
+
+
+def coordinate_neighbors(theta, steps):
+    """
+    座標方向的鄰域（Greedy.py 用的）：每一維各往正、負方向走一步，共 2d 個。
+    順序為 +e0, -e0, +e1, -e1, ...
+    """
+    d = theta.size
+    offsets = np.zeros((2 * d, d))
+    idx = np.arange(d)
+    offsets[2 * idx, idx] = steps
+    offsets[2 * idx + 1, idx] = -steps
+    return theta + offsets
+
+
+_GRID_CACHE = {}
+
+
+def grid_neighbors(theta, steps):
+    """
+    完整格點鄰域（Improvw.py 用的 3x3 推廣到 d 維）：每一維取 {-1, 0, 1} 步，共 3^d 個（含原點）。
+    順序與巢狀的 for k in [-1, 0, 1]: for l in [-1, 0, 1] 相同。
+    """
+    d = theta.size
+    if d not in _GRID_CACHE:
+        _GRID_CACHE[d] = np.array(list(itertools.product((-1, 0, 1), repeat=d)), dtype=np.float64)
+    return theta + _GRID_CACHE[d] * steps
+
+
+NEIGHBORHOODS = {
+    "coordinate": coordinate_neighbors,
+    "grid": grid_neighbors,
+}
+
+
+def local_search(batch_cost, theta0, step=0.1, neighborhood="coordinate",
+                 shrink=0.5, min_step=1e-6, max_iter=10000, trace=None):
+    """
+    貪婪的局部搜尋：每一輪評估整個鄰域，若最好的鄰居比目前好就移過去，否則把步長乘上 shrink；
+    所有維度的步長都小於 min_step 時視為收斂。
+
+    參數：
+      batch_cost:   batch_cost(thetas) -> 長度 m 的陣列，thetas 是 m×d 的候選參數
+      theta0:       初始參數（d 維）
+      step:         初始步長，可以是純量或每一維各自的步長
+      neighborhood: "coordinate"（2d 個鄰居）或 "grid"（3^d 個鄰居），也可以直接傳入函式
+      trace:        TraceRecorder，每一輪記錄 cost、參數與最大的步長
+    回傳：(theta, cost, 迭代次數)
+    """
+    make_neighbors = NEIGHBORHOODS.get(neighborhood, neighborhood)
+    if not callable(make_neighbors):
+        raise ValueError(f"未知的 neighborhood: {neighborhood}")
+    theta = np.array(theta0, dtype=np.float64).ravel()
+    steps = np.broadcast_to(np.asarray(step, dtype=np.float64), theta.shape).copy()
+    best_cost = float(batch_cost(theta[None, :])[0])
+
+    it = 0
+    for it in range(1, max_iter + 1):
+        candidates = make_neighbors(theta, steps)
+        costs = batch_cost(candidates)
+        k = int(np.argmin(costs))
+        if costs[k] < best_cost:
+            # 有改善 → 接受這個 move
+            theta, best_cost = candidates[k], float(costs[k])
+        else:
+            # 沒改善 → 縮小步長
+            steps *= shrink
+        if trace is not None:
+            trace.record(it, best_cost, theta, steps.max())
+        if np.all(steps < min_step):
+            break
+    return theta, best_cost, it
+
+
+if __name__ == "__main__":
+    import time
+
+    from linreg import LeastSquaresMSE, polynomial_features
+
+    # 三次多項式迴歸：d = 4 個參數，一百萬筆資料
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1, 1, 1_000_000)
+    true_theta = np.array([1.0, -2.0, 0.5, 3.0])
+    y = polynomial_features(x, 3) @ true_theta + rng.normal(0, 0.1, x.size)
+    objective = LeastSquaresMSE(polynomial_features(x, 3), y)
+
+    print("最小平方法的解：", np.round(objective.solve(), 4))
+    for name in NEIGHBORHOODS:
+        start = time.perf_counter()
+        theta, c, iters = local_search(objective.batch_cost, np.zeros(4), neighborhood=name,
+                                       max_iter=100000)
+        elapsed = time.perf_counter() - start
+        print(f"{name:10s} 鄰域：theta = {np.round(theta, 4)}, MSE = {c:.6f}, "
+              f"{iters} 輪, {elapsed:.2f} 秒")
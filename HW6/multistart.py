@@ -0,0 +1,102 @@
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 多起點 (multi-start) 爬山：同時跑 K 條互相獨立的爬山，各自從不同的隨機起點出發，最後取最好的。
+# 非凸的目標函數只跑一條容易卡在局部最佳解，多跑幾條、分散到多個 process 上，
+# 同樣的時間內可以找到更好的解。
+#
+# 每一條爬山用 SeedSequence(seed).spawn(K) 分到自己的亂數產生器，每一條的亂數序列只由 seed 決定。
+# 沒有設定 target、climb 也不讀 best_so_far() 時，不論用幾個 process、誰先跑完結果都一樣；
+# 設定了 target 時，哪些爬山被提早停掉（或根本沒開始）取決於排程，結果就不保證能重現。
+#
+# 爬山函式的介面：climb(rng, report, **kwargs) -> (x, loss)
+#   rng:    np.random.Generator
+#   report: report(x, loss) -> bool，每隔一段時間呼叫一次回報目前的解；
+#           回傳 True 代表已經有人達到目標，應該提早結束；
+#           解很大時迴圈中可以傳 x=None 只回報 loss（只檢查 target，不更新共享的最佳解），
+#           結束前再回報一次完整的解
+# climb 可以呼叫 best_so_far() 取得所有爬山目前最好的解，例如落後太多時直接跳過去繼續爬。
+# climb 必須定義在模組的最上層（要能 pickle 送到其他 process）。
+
+_SHARED = None      # (目前最好的 loss, 目前最好的解, 停止旗標)，由 _init_worker 設定
+
+
+def _init_worker(best, best_x, stop):
+    global _SHARED
+    _SHARED = (best, best_x, stop)
+
+
+class _Reporter:
+    def __init__(self, target):
+        self.target = target
+
+    def __call__(self, x, loss):
+        best, best_x, stop = _SHARED
+        if x is not None:
+            with best.get_lock():
+                if loss < best.value:
+                    best.value = loss
+                    best_x[:] = np.ravel(x)
+        if self.target is not None and loss <= self.target:
+            stop.set()
+        return stop.is_set()
+
+
+def _run_climber(climb, seed_seq, target, kwargs):
+    if _SHARED[2].is_set():
+        return None                     # 別人已經達到目標，不必再開始
+    rng = np.random.default_rng(seed_seq)
+    return climb(rng, _Reporter(target), **kwargs)
+
+
+def best_so_far():
+    """在 climb 裡呼叫：目前所有爬山中最好的 (loss, x)；還沒有人回報時 x 為 None。"""
+    best, best_x, _ = _SHARED
+    with best.get_lock():
+        if best.value == math.inf:
+            return math.inf, None
+        return best.value, np.array(best_x[:])
+
+
+def multistart(climb, n_starts, dim, seed=None, workers=None, target=None, **kwargs):
+    """
+    用 process pool 平行跑 n_starts 條爬山。
+
+    參數：
+      climb:    爬山函式，介面見檔案開頭
+      n_starts: 要跑幾條
+      dim:      解的維度（共享的最佳解陣列大小）
+      seed:     整體的亂數種子（None 代表每次都不同）
+      workers:  process 數，None 代表 CPU 核心數
+      target:   任何一條的 loss <= target 時，通知所有爬山提早結束（此時結果不保證能重現）
+      kwargs:   原封不動傳給 climb
+    回傳：(最好的 x, 最好的 loss, 每一條的 loss 列表)
+          因為提早結束而沒有開始的爬山，loss 記為 inf
+    """
+    if n_starts <= 0:
+        raise ValueError("n_starts 必須是正整數")
+    children = np.random.SeedSequence(seed).spawn(n_starts)
+    ctx = mp.get_context()
+    best = ctx.Value("d", math.inf)
+    shared_x = ctx.Array("d", dim, lock=False)    # 用 best 的鎖保護
+    stop = ctx.Event()
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(best, shared_x, stop)) as ex:
+        futures = [ex.submit(_run_climber, climb, child, target, kwargs) for child in children]
+        results = [f.result() for f in futures]
+
+    best_x, best_loss = None, math.inf
+    losses = []
+    for r in results:
+        if r is None:
+            losses.append(math.inf)
+            continue
+        x, loss = r
+        losses.append(loss)
+        if loss < best_loss:
+            best_x, best_loss = x, loss
+    return best_x, best_loss, losses
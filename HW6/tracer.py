@@ -0,0 +1,99 @@
+import argparse
+import time
+
+import numpy as np
+
+# 記錄最佳化過程的軌跡：迭代次數、loss、參數、步長、經過時間。
+# 資料寫進預先配置好的 NumPy 環狀緩衝區 (ring buffer)，迴圈裡不配置記憶體、不印東西，
+# 滿了就覆蓋最舊的紀錄；跑完再一次輸出成 .npy 或 CSV 分析收斂情形。
+
+
+class TraceRecorder:
+    """
+    參數：
+      capacity:       最多保留幾筆（超過時只留最新的 capacity 筆）
+      every:          每隔幾次迭代記一筆（iteration % every == 0 才記）；
+                      只需要看其中一部分時就用它取樣，沒記到的輪次只多一次取餘數
+      record_params:  是否記錄參數；參數很多（例如 K=10^6 的分佈）時應該設成 False
+    欄位：iteration, loss, step, elapsed, param_0, param_1, ...
+    緩衝區在第一次 record 時才配置，那時才知道參數有幾維。
+    """
+
+    def __init__(self, capacity=10000, every=1, record_params=True):
+        if capacity <= 0 or every <= 0:
+            raise ValueError("capacity 與 every 必須是正整數")
+        self.capacity = capacity
+        self.every = every
+        self.record_params = record_params
+        self.buffer = None
+        self.count = 0
+        self.start = time.perf_counter()
+
+    def record(self, iteration, loss, params=None, step=np.nan):
+        if iteration % self.every:
+            return
+        buf = self.buffer
+        if buf is None:
+            n_params = 0 if params is None or not self.record_params else np.size(params)
+            buf = self.buffer = np.empty((self.capacity, 4 + n_params))
+        i = self.count % self.capacity
+        buf[i, :4] = (iteration, loss, step, time.perf_counter() - self.start)
+        if buf.shape[1] > 4:
+            # 直接寫進緩衝區，不另外配置陣列；只有多維的參數才需要先攤平
+            try:
+                buf[i, 4:] = params
+            except ValueError:
+                buf[i, 4:] = np.ravel(params)
+        self.count += 1
+
+    @property
+    def columns(self):
+        n_params = 0 if self.buffer is None else self.buffer.shape[1] - 4
+        return ["iteration", "loss", "step", "elapsed"] + [f"param_{k}" for k in range(n_params)]
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def to_array(self):
+        """依時間先後排好的紀錄 (筆數 × 欄位數)。"""
+        if self.buffer is None:
+            return np.empty((0, 4))
+        if self.count <= self.capacity:
+            return self.buffer[:self.count].copy()
+        head = self.count % self.capacity
+        return np.concatenate([self.buffer[head:], self.buffer[:head]])
+
+    def save(self, path):
+        """副檔名是 .npy 就存成 NumPy 陣列，.csv 就存成有標題列的 CSV。"""
+        data = self.to_array()
+        if path.endswith(".npy"):
+            np.save(path, data)
+        elif path.endswith(".csv"):
+            np.savetxt(path, data, delimiter=",", header=",".join(self.columns),
+                       comments="", fmt="%.10g")
+        else:
+            raise ValueError(f"不支援的檔案格式: {path}")
+
+    def print_summary(self, every=None, fmt=None):
+        """
+        把紀錄印出來（取代原本迴圈裡的 print）。every 指定時只印 iteration % every == 0 的列；
+        fmt(row) 可以自訂每一列的格式。
+        """
+        for row in self.to_array():
+            if every is not None and int(row[0]) % every:
+                continue
+            if fmt is not None:
+                print(fmt(row))
+            else:
+                line = (f"iter {int(row[0])}, loss = {row[1]:.6f}, step = {row[2]:.5g}, "
+                        f"t = {row[3] * 1000:.1f}ms")
+                if row.size > 4:
+                    line += "  params = " + " ".join(f"{v:.4f}" for v in row[4:])
+                print(line)
+
+
+def trace_argument_parser(description=None):
+    """各最佳化程式共用的命令列參數：--trace PATH 把軌跡存檔。需要其他參數時自己再 add_argument。"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--trace", metavar="PATH", help="把最佳化軌跡存成 .npy 或 .csv")
+    return parser
@@ -0,0 +1,487 @@
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+# 一般化的過河問題：
+#   N 個角色、一艘最多載 capacity 個角色的船、一組「哪些角色不能單獨待在同一岸」的規則。
+# 狀態是 N+1 bits 的整數：第 k 個 bit 為 1 代表第 k 個角色在右岸，第 N 個 bit 是船的位置。
+
+
+def encode(state, right='R'):
+    """把 ('L', 'R', ...) 形式的狀態轉成 bitmask（最後一個元素可以是船的位置）。"""
+    bits = 0
+    for k, side in enumerate(state):
+        if side == right:
+            bits |= 1 << k
+    return bits
+
+
+def decode(bits, n, left='L', right='R'):
+    """把 bitmask 的前 n 個 bit 轉回 ('L', 'R', ...) 形式的狀態。"""
+    return tuple(right if bits >> k & 1 else left for k in range(n))
+
+
+class Forbid:
+    """
+    宣告式的衝突規則：同一岸上 group 裡的角色全部都在、
+    而 unless 裡的角色一個都不在時，這個狀態就不合法。
+
+    例如 Forbid(["狼", "羊"], unless=["人"]) 代表「人不在時，狼和羊不能在同一岸」。
+    """
+
+    def __init__(self, group, unless=()):
+        self.group = list(group)
+        self.unless = list(unless)
+
+
+class CrossingPuzzle:
+    """
+    參數：
+      entities: 角色名稱 list
+      capacity: 船一次最多載幾個角色（包含划船的人）
+      rules:    Forbid 規則 list
+      drivers:  會划船的角色，None 代表只有 entities[0] 會划船
+    """
+
+    def __init__(self, entities, capacity, rules, drivers=None):
+        self.entities = list(entities)
+        self.n = len(self.entities)
+        self.capacity = capacity
+        index = {name: k for k, name in enumerate(self.entities)}
+
+        def mask(names):
+            m = 0
+            for name in names:
+                m |= 1 << index[name]
+            return m
+
+        self.all_mask = (1 << self.n) - 1
+        self.boat_bit = 1 << self.n
+        self.rules = [(mask(r.group), mask(r.unless)) for r in rules]
+        # 角色不多時用 2^n bytes 的表快取每一岸是否安全
+        self._bank_cache = bytearray(1 << self.n) if self.n <= 24 else None
+        self._safety_table = None
+        self._transition_table = None
+        driver_mask = mask(drivers if drivers is not None else self.entities[:1])
+
+        # 所有可能的載客組合：1 ~ capacity 個角色，且至少一個會划船
+        self.moves = []
+        for size in range(1, capacity + 1):
+            for group in combinations(range(self.n), size):
+                mv = 0
+                for k in group:
+                    mv |= 1 << k
+                if mv & driver_mask:
+                    self.moves.append(mv)
+
+    # ---------- 狀態 ----------
+
+    def bank_is_safe(self, bank):
+        # 同一岸的組合會反覆出現，查過的結果記下來（0 未知、1 安全、2 不安全）
+        cached = self._bank_cache[bank] if self._bank_cache is not None else 0
+        if cached:
+            return cached == 1
+        ok = True
+        for group, unless in self.rules:
+            if bank & group == group and not bank & unless:
+                ok = False
+                break
+        if self._bank_cache is not None:
+            self._bank_cache[bank] = 1 if ok else 2
+        return ok
+
+    def is_safe(self, s):
+        right = s & self.all_mask
+        return self.bank_is_safe(right) and self.bank_is_safe(~s & self.all_mask)
+
+    def neighbors(self, s):
+        """產生 (下一個狀態, 載客 bitmask)。"""
+        # 船所在那一岸的角色
+        here = s & self.all_mask if s & self.boat_bit else ~s & self.all_mask
+        there = self.all_mask & ~here
+        for mv in self.moves:
+            if mv & here == mv:
+                # 留下來的那一岸與抵達的那一岸都要安全
+                if self.bank_is_safe(here ^ mv) and self.bank_is_safe(there | mv):
+                    yield s ^ mv ^ self.boat_bit, mv
+
+    def bank_safety_table(self):
+        """
+        一次算好所有 2^n 種「一岸上有誰」的組合是否安全，回傳 bool 陣列。
+        給平行 BFS 向量化查表用。
+        """
+        if self._safety_table is None:
+            banks = np.arange(1 << self.n, dtype=np.int64)
+            safe = np.ones(1 << self.n, dtype=bool)
+            for group, unless in self.rules:
+                safe &= ~(((banks & group) == group) & ((banks & unless) == 0))
+            self._safety_table = safe
+        return self._safety_table
+
+    def expand_many(self, states):
+        """
+        在目前的 process 裡向量化展開一批狀態。
+        回傳 (children, parents)：每一條邊 parents[k] -> children[k]。
+        """
+        _init_expand_worker(self.moves, self.bank_safety_table(), self.all_mask, self.boat_bit)
+        return _expand_frontier(np.asarray(states, dtype=np.int64))
+
+    def transition_table(self):
+        """整個狀態空間預先算好的 TransitionTable（第一次呼叫時建立，之後共用）。"""
+        if self._transition_table is None:
+            self._transition_table = TransitionTable(self)
+        return self._transition_table
+
+    def start_state(self):
+        return 0
+
+    def goal_state(self):
+        return self.all_mask | self.boat_bit
+
+    def heuristic(self, s, goal):
+        """
+        可採納 (admissible) 的估計：每趟船最多改變 capacity 個角色的位置，
+        所以至少還要 ceil(位置不對的角色數 / capacity) 趟。
+        每走一步估計值最多變 1，因此也是一致 (consistent) 的。
+        """
+        wrong = bin((s ^ goal) & self.all_mask).count("1")
+        return -(-wrong // self.capacity)
+
+    # ---------- 搜尋 ----------
+
+    def solve(self, start=None, goal=None, method="bidirectional", workers=None):
+        """
+        method: "bfs"、"bidirectional"（雙向 BFS）、"astar"、
+                "table"（在預先算好的 TransitionTable 上查表 BFS，適合狀態空間小、要解很多次的題目）
+                或 "parallel"（逐層同步、用 process pool 展開的 BFS）
+        workers: "parallel" 使用的 process 數，None 代表 os.cpu_count()
+        回傳：(path, stats)
+          path:  [(state, move), ...]，起點的 move 為 0；無解時為 None
+          stats: {"method", "nodes_expanded", "seconds", "length"}
+        """
+        start = self.start_state() if start is None else start
+        goal = self.goal_state() if goal is None else goal
+        search = {"bfs": self._bfs, "bidirectional": self._bidirectional,
+                  "astar": self._astar,
+                  "table": lambda s, g: self.transition_table().bfs(s, g),
+                  "parallel": lambda s, g: self._parallel_bfs(s, g, workers)}.get(method)
+        if search is None:
+            raise ValueError(f"未知的 method: {method}")
+
+        t0 = time.perf_counter()
+        if not (self.is_safe(start) and self.is_safe(goal)):
+            path, expanded = None, 0
+        else:
+            path, expanded = search(start, goal)
+        stats = {
+            "method": method,
+            "nodes_expanded": expanded,
+            "seconds": time.perf_counter() - t0,
+            "length": None if path is None else len(path) - 1,
+        }
+        return path, stats
+
+    @staticmethod
+    def _trace(parent, s):
+        # parent[s] = (前一個狀態, 載客)，回溯到起點
+        path = []
+        while s is not None:
+            prev, mv = parent[s]
+            path.append((s, mv))
+            s = prev
+        path.reverse()
+        return path
+
+    def _bfs(self, start, goal):
+        parent = {start: (None, 0)}
+        frontier = [start]
+        expanded = 0
+        while frontier:
+            next_frontier = []
+            for s in frontier:
+                if s == goal:
+                    return self._trace(parent, s), expanded
+                expanded += 1
+                for t, mv in self.neighbors(s):
+                    if t not in parent:
+                        parent[t] = (s, mv)
+                        next_frontier.append(t)
+            frontier = next_frontier
+        return None, expanded
+
+    def _bidirectional(self, start, goal):
+        """
+        從起點與終點同時做 BFS，每次展開比較小的那一邊的一整層。
+        過河一定可以原路返回（原狀態是安全的），所以反向搜尋可以用同一個 neighbors。
+        """
+        if start == goal:
+            return [(start, 0)], 0
+        parent_f = {start: (None, 0)}
+        parent_b = {goal: (None, 0)}
+        frontier_f, frontier_b = [start], [goal]
+        expanded = 0
+
+        while frontier_f and frontier_b:
+            forward = len(frontier_f) <= len(frontier_b)
+            frontier, parent, other = ((frontier_f, parent_f, parent_b) if forward
+                                       else (frontier_b, parent_b, parent_f))
+            next_frontier = []
+            meet = None
+            for s in frontier:
+                expanded += 1
+                for t, mv in self.neighbors(s):
+                    if t in parent:
+                        continue
+                    parent[t] = (s, mv)
+                    next_frontier.append(t)
+                    # 同一層裡第一個碰到另一邊的點長度就是最短（兩邊都是逐層展開）
+                    if t in other:
+                        meet = t
+                        break
+                if meet is not None:
+                    break
+            if meet is not None:
+                head = self._trace(parent_f, meet)
+                tail = self._trace(parent_b, meet)     # goal -> ... -> meet
+                # 反向那一半：邊上的載客組合和方向無關，沿路把 move 往後挪一格
+                tail.reverse()
+                for k in range(1, len(tail)):
+                    head.append((tail[k][0], tail[k - 1][1]))
+                return head, expanded
+            if forward:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
+        return None, expanded
+
+    def _astar(self, start, goal):
+        g = {start: 0}
+        parent = {start: (None, 0)}
+        heap = [(self.heuristic(start, goal), 0, start)]
+        expanded = 0
+        while heap:
+            f, gs, s = heapq.heappop(heap)
+            if gs > g[s]:
+                continue        # 過期的項目
+            if s == goal:
+                return self._trace(parent, s), expanded
+            expanded += 1
+            for t, mv in self.neighbors(s):
+                gt = gs + 1
+                if gt < g.get(t, gt + 1):
+                    g[t] = gt
+                    parent[t] = (s, mv)
+                    heapq.heappush(heap, (gt + self.heuristic(t, goal), gt, t))
+        return None, expanded
+
+    def _parallel_bfs(self, start, goal, workers=None):
+        """
+        逐層同步 (level-synchronous) 的 BFS：
+          1. 把這一層的 frontier 切塊，交給 process pool 向量化展開；
+          2. 合併所有子狀態，用 parent 陣列去掉已拜訪的，再用 np.unique 排序去重，
+             每個新狀態只保留一個 parent；
+          3. 排序後的新狀態就是下一層的 frontier。
+        parent 是以狀態編號為索引的整數陣列（-1 代表未拜訪），同時當作 visited，
+        過河的載客組合可以從 parent ^ child 還原，不必另外存。
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        size = 1 << (self.n + 1)
+        dtype = np.int32 if size <= 1 << 31 else np.int64
+        parent = np.full(size, -1, dtype=dtype)
+        parent[start] = start
+        frontier = np.array([start], dtype=np.int64)
+        expanded = 0
+
+        initargs = (self.moves, self.bank_safety_table(), self.all_mask, self.boat_bit)
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_expand_worker,
+                                       initargs=initargs)
+        else:
+            _init_expand_worker(*initargs)
+        try:
+            while frontier.size and parent[goal] == -1:
+                expanded += frontier.size
+                if pool is None:
+                    results = [_expand_frontier(frontier)]
+                else:
+                    chunks = np.array_split(frontier, min(frontier.size, workers * 4))
+                    results = list(pool.map(_expand_frontier, chunks))
+                children = np.concatenate([c for c, _ in results])
+                parents = np.concatenate([p for _, p in results])
+
+                fresh = parent[children] == -1
+                children, parents = children[fresh], parents[fresh]
+                frontier, first = np.unique(children, return_index=True)
+                parent[frontier] = parents[first]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if parent[goal] == -1:
+            return None, expanded
+        path = []
+        s = goal
+        while s != start:
+            p = int(parent[s])
+            path.append((s, (s ^ p) & self.all_mask))
+            s = p
+        path.append((start, 0))
+        path.reverse()
+        return path, expanded
+
+    # ---------- 輸出 ----------
+
+    def describe(self, path):
+        """把路徑印成每一步誰過河、兩岸各有誰。"""
+        def names(bits):
+            return ",".join(self.entities[k] for k in range(self.n) if bits >> k & 1) or "-"
+
+        for i, (s, mv) in enumerate(path):
+            left = names(~s & self.all_mask)
+            right = names(s & self.all_mask)
+            action = "起點" if i == 0 else f"{names(mv)} 過河"
+            boat = "右" if s & self.boat_bit else "左"
+            print(f"步驟 {i:3d}: {action:16s} 左岸[{left}] 右岸[{right}] 船在{boat}岸")
+
+
+class TransitionTable:
+    """
+    預先算好整個狀態空間（2^(N+1) 個狀態，含船的位置）的安全狀態與鄰接表。
+
+    鄰接表以 CSR 格式存在平坦的 NumPy 陣列裡：
+      狀態 s 的鄰居是 targets[offsets[s]:offsets[s+1]]，依 puzzle.moves 的順序排列，
+      過河的載客組合是 (s ^ t) & all_mask。
+    搜尋時展開一個狀態只需要查表，不必再檢查規則。狀態空間是 2^(N+1)，只適合角色不多的題目。
+    """
+
+    def __init__(self, puzzle):
+        self.puzzle = puzzle
+        self.all_mask = puzzle.all_mask
+        self.size = 1 << (puzzle.n + 1)
+        states = np.arange(self.size, dtype=np.int64)
+        safe_banks = puzzle.bank_safety_table()
+        self.safe = safe_banks[states & self.all_mask] & safe_banks[~states & self.all_mask]
+
+        children, parents = puzzle.expand_many(states[self.safe])
+        order = np.argsort(parents, kind="stable")      # 同一個狀態的鄰居維持 moves 的順序
+        self.targets = children[order]
+        self.offsets = np.searchsorted(parents[order], np.arange(self.size + 1))
+
+    def neighbors(self, s):
+        """回傳 [(下一個狀態, 載客 bitmask), ...]"""
+        return [(int(t), (s ^ int(t)) & self.all_mask)
+                for t in self.targets[self.offsets[s]:self.offsets[s + 1]]]
+
+    def bfs(self, start, goal):
+        """
+        在預先算好的表上做 BFS。
+        parent 是以狀態編號為索引的平坦陣列（-1 代表還沒拜訪），同時當作 visited。
+        回傳 (path, 展開節點數)，path 格式與 CrossingPuzzle.solve 相同；找不到解時 path 為 None。
+        """
+        if not (self.safe[start] and self.safe[goal]):
+            return None, 0
+        parent = [-1] * self.size
+        parent[start] = start
+        offsets, targets = self.offsets.tolist(), self.targets.tolist()
+        expanded = 0
+
+        frontier = [start]
+        while frontier and parent[goal] == -1:
+            next_frontier = []
+            for s in frontier:
+                expanded += 1
+                for k in range(offsets[s], offsets[s + 1]):
+                    t = targets[k]
+                    if parent[t] == -1:
+                        parent[t] = s
+                        next_frontier.append(t)
+            frontier = next_frontier
+
+        if parent[goal] == -1:
+            return None, expanded
+        path = []
+        s = goal
+        while s != start:
+            path.append((s, (s ^ parent[s]) & self.all_mask))
+            s = parent[s]
+        path.append((start, 0))
+        path.reverse()
+        return path, expanded
+
+
+# ---------- 平行 BFS 的 worker ----------
+# 每個 worker process 啟動時收到一次載客組合與安全表，之後只傳 frontier 區塊。
+_EXPAND = {}
+
+
+def _init_expand_worker(moves, safe_banks, all_mask, boat_bit):
+    _EXPAND["moves"] = moves
+    _EXPAND["safe"] = safe_banks
+    _EXPAND["all_mask"] = all_mask
+    _EXPAND["boat_bit"] = boat_bit
+
+
+def _expand_frontier(frontier):
+    """
+    向量化展開一塊 frontier：對每一種載客組合，一次處理所有狀態。
+    回傳 (children, parents) 兩個等長的 int64 陣列。
+    """
+    safe = _EXPAND["safe"]
+    all_mask, boat_bit = _EXPAND["all_mask"], _EXPAND["boat_bit"]
+    here = np.where(frontier & boat_bit, frontier & all_mask, ~frontier & all_mask)
+    there = all_mask ^ here
+    children, parents = [], []
+    for mv in _EXPAND["moves"]:
+        ok = (here & mv) == mv
+        if not ok.any():
+            continue
+        ok &= safe[here ^ mv] & safe[there | mv]
+        sel = frontier[ok]
+        children.append(sel ^ (mv | boat_bit))
+        parents.append(sel)
+    if not children:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(children), np.concatenate(parents)
+
+
+def wolf_goat_cabbage():
+    """原本的狼、羊、菜問題。"""
+    return CrossingPuzzle(
+        ["人", "狼", "羊", "菜"], capacity=2,
+        rules=[Forbid(["狼", "羊"], unless=["人"]), Forbid(["羊", "菜"], unless=["人"])])
+
+
+def jealous_couples(n_couples, capacity):
+    """
+    較大的測試題（嫉妒的丈夫問題）：n 對夫妻，每個人都會划船；
+    妻子 i 的丈夫不在場時，她不能和別的丈夫待在同一岸。
+    狀態空間 2^(2n + 1)。
+    """
+    names = []
+    for i in range(n_couples):
+        names += [f"夫{i}", f"妻{i}"]
+    rules = [Forbid([f"妻{i}", f"夫{j}"], unless=[f"夫{i}"])
+             for i in range(n_couples) for j in range(n_couples) if i != j]
+    return CrossingPuzzle(names, capacity=capacity, rules=rules, drivers=names)
+
+
+if __name__ == "__main__":
+    puzzle = wolf_goat_cabbage()
+    path, stats = puzzle.solve(method="astar")
+    print("狼羊菜（A*）：")
+    puzzle.describe(path)
+    print(stats)
+
+    print("\n較大的題目：10 對夫妻，船載 4（狀態空間 2^21）")
+    big = jealous_couples(10, capacity=4)
+    for method in ["bidirectional", "astar", "parallel"]:
+        path, stats = big.solve(method=method)
+        print(f"  {method:14s} 步數={stats['length']} 展開節點={stats['nodes_expanded']}"
+              f" 時間={stats['seconds']:.3f}s")
@@ -0,0 +1,199 @@
+import json
+import os
+
+import numpy as np
+
+from river_crossing import CrossingPuzzle, jealous_couples, wolf_goat_cabbage
+
+# 把「所有能走到終點的狀態」組成的圖一次建好、存檔。
+# 之後任何起點的最短路徑、最短解的數量、逐一列舉所有最短解，都只要查表，不必重新搜尋。
+#
+# 存檔格式（一個資料夾，每個陣列一個 .npy，可用 mmap 開啟）：
+#   states.npy   排序過的狀態編號（int64），節點 i 代表狀態 states[i]
+#   offsets.npy  CSR 鄰接表：節點 i 的鄰居是 targets[offsets[i]:offsets[i+1]]
+#   targets.npy  鄰居的節點編號（int32）
+#   dist.npy     每個節點到終點的最短步數（int32）
+#   counts.npy   每個節點到終點的最短路徑數（int64），建圖時一次算好
+#   meta.json    角色、船的容量、終點狀態等資訊
+# 過河一定可以原路返回，所以圖是無向的；兩個狀態之間的載客組合就是 (s ^ t) & all_mask。
+
+
+def build_state_graph(puzzle: CrossingPuzzle, goal=None, chunk_size=1 << 16):
+    """
+    從終點做逐層 BFS 找出整個連通分量與每個狀態到終點的距離，
+    再展開所有節點建立 CSR 鄰接表。回傳 StateGraph（資料在記憶體中）。
+    """
+    goal = puzzle.goal_state() if goal is None else goal
+    size = 1 << (puzzle.n + 1)
+    dist = np.full(size, -1, dtype=np.int32)
+    if not puzzle.is_safe(goal):
+        raise ValueError("終點狀態不合法")
+    dist[goal] = 0
+    frontier = np.array([goal], dtype=np.int64)
+    level = 0
+    while frontier.size:
+        level += 1
+        children, _ = puzzle.expand_many(frontier)
+        children = np.unique(children[dist[children] == -1])
+        dist[children] = level
+        frontier = children
+
+    states = np.nonzero(dist >= 0)[0].astype(np.int64)
+    src_parts, dst_parts = [], []
+    for lo in range(0, len(states), chunk_size):
+        children, parents = puzzle.expand_many(states[lo:lo + chunk_size])
+        src_parts.append(np.searchsorted(states, parents))
+        dst_parts.append(np.searchsorted(states, children))
+    src = np.concatenate(src_parts)
+    dst = np.concatenate(dst_parts)
+    order = np.argsort(src, kind="stable")
+    targets = dst[order].astype(np.int32)
+    offsets = np.searchsorted(src[order], np.arange(len(states) + 1)).astype(np.int64)
+
+    node_dist = dist[states]
+    counts = _count_shortest_paths(src, dst, node_dist)
+
+    meta = {"entities": puzzle.entities, "capacity": puzzle.capacity,
+            "goal": int(goal), "all_mask": puzzle.all_mask}
+    return StateGraph(states, offsets, targets, node_dist, counts, meta)
+
+
+def _count_shortest_paths(src, dst, dist):
+    """
+    每個節點到終點的最短路徑數。只看往終點走一步的邊（dist 剛好少 1），
+    依距離由小到大逐層累加：count[v] = Σ count[u]，u 是 v 往終點的下一步。
+    """
+    down = dist[dst] == dist[src] - 1
+    src, dst = src[down], dst[down]
+    order = np.argsort(dist[src], kind="stable")
+    src, dst = src[order], dst[order]
+    bounds = np.searchsorted(dist[src], np.arange(1, int(dist.max()) + 2))
+
+    count = (dist == 0).astype(np.int64)
+    approx = count.astype(np.float64)       # 用浮點數平行累加，檢查 int64 是否溢位
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        np.add.at(count, src[lo:hi], count[dst[lo:hi]])
+        np.add.at(approx, src[lo:hi], approx[dst[lo:hi]])
+    if approx.max() >= 2.0 ** 63:
+        raise ValueError("最短解的數量超過 int64 能表示的範圍")
+    return count
+
+
+_ARRAYS = ("states", "offsets", "targets", "dist", "counts")
+
+
+class StateGraph:
+    def __init__(self, states, offsets, targets, dist, counts, meta):
+        self.states = states
+        self.offsets = offsets
+        self.targets = targets
+        self.dist = dist
+        self.counts = counts
+        self.meta = meta
+        self.all_mask = meta["all_mask"]
+
+    def __len__(self):
+        return len(self.states)
+
+    # ---------- 存檔 / 載入 ----------
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fp:
+            json.dump(self.meta, fp, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """mmap=True 時陣列以唯讀 memory-map 開啟，不會整個讀進記憶體。"""
+        mode = "r" if mmap else None
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+                  for name in _ARRAYS]
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fp:
+            meta = json.load(fp)
+        return cls(*arrays, meta)
+
+    # ---------- 查詢 ----------
+
+    def index(self, state):
+        """狀態編號 -> 節點編號；不在圖裡（走不到終點）時回傳 None。"""
+        i = int(np.searchsorted(self.states, state))
+        if i < len(self.states) and self.states[i] == state:
+            return i
+        return None
+
+    def distance(self, state):
+        """到終點的最短步數；走不到時回傳 None。"""
+        i = self.index(state)
+        return None if i is None else int(self.dist[i])
+
+    def _next_layer(self, i):
+        # 沿著最短路徑往終點走一步可以到的鄰居（距離剛好少 1）
+        nbrs = self.targets[self.offsets[i]:self.offsets[i + 1]]
+        return nbrs[self.dist[nbrs] == self.dist[i] - 1]
+
+    def _as_path(self, nodes):
+        path = [(int(self.states[nodes[0]]), 0)]
+        for a, b in zip(nodes, nodes[1:]):
+            sa, sb = int(self.states[a]), int(self.states[b])
+            path.append((sb, (sa ^ sb) & self.all_mask))
+        return path
+
+    def shortest_path(self, start):
+        """任一起點到終點的一條最短路徑 [(state, move), ...]；走不到時回傳 None。"""
+        i = self.index(start)
+        if i is None:
+            return None
+        nodes = [i]
+        while self.dist[nodes[-1]] > 0:
+            nodes.append(int(self._next_layer(nodes[-1])[0]))
+        return self._as_path(nodes)
+
+    def count_shortest_paths(self, start):
+        """起點到終點的最短解有幾條（建圖時已算好，直接查表）；走不到時回傳 0。"""
+        i = self.index(start)
+        return 0 if i is None else int(self.counts[i])
+
+    def iter_shortest_paths(self, start):
+        """逐一（lazy）產生起點到終點的所有最短解，用明確堆疊做 DFS。"""
+        i = self.index(start)
+        if i is None:
+            return
+        nodes = [i]
+        stack = [iter(self._next_layer(i))]
+        while stack:
+            if self.dist[nodes[-1]] == 0:
+                yield self._as_path(nodes)
+                stack.pop()
+                nodes.pop()
+                continue
+            u = next(stack[-1], None)
+            if u is None:
+                stack.pop()
+                nodes.pop()
+                continue
+            nodes.append(int(u))
+            stack.append(iter(self._next_layer(int(u))))
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    puzzle = wolf_goat_cabbage()
+    with tempfile.TemporaryDirectory() as tmp:
+        build_state_graph(puzzle).save(tmp)
+        graph = StateGraph.load(tmp)
+
+        start = puzzle.start_state()
+        print(f"狼羊菜：圖上共 {len(graph)} 個狀態，起點到終點最短 {graph.distance(start)} 步，"
+              f"共有 {graph.count_shortest_paths(start)} 種最短解")
+        for k, path in enumerate(graph.iter_shortest_paths(start)):
+            print(f"\n最短解 {k + 1}：")
+            puzzle.describe(path)
+
+    couples = jealous_couples(3, capacity=2)
+    graph = build_state_graph(couples)
+    start = couples.start_state()
+    print(f"\n3 對夫妻、船載 2：圖上共 {len(graph)} 個狀態，最短 {graph.distance(start)} 步，"
+          f"共有 {graph.count_shortest_paths(start)} 種最短解")
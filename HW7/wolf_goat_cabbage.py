@@ -1,5 +1,7 @@
 from collections import deque
 
+from river_crossing import decode, encode, wolf_goat_cabbage
+
 # 狀態: (M, W, G, C)  分別代表 人, 狼, 羊, 菜 在左岸(L)或右岸(R)
 LEFT = 'L'
 RIGHT = 'R'
@@ -87,6 +89,27 @@ def bfs(start, goal):
     return None   
 
 
+# ===== 位元壓縮版本：在 river_crossing 預先算好的狀態表上查表搜尋 =====
+# bit 0: 人、bit 1: 狼、bit 2: 羊、bit 3: 菜，1 代表在右岸；bit 4 是船，船永遠跟著人
+PUZZLE = wolf_goat_cabbage()
+TABLE = PUZZLE.transition_table()
+PASSENGERS = {0b0001: None, 0b0011: 'W', 0b0101: 'G', 0b1001: 'C'}   # 載客 bitmask -> passenger
+
+
+def _pack(state):
+    bits = encode(state, RIGHT)
+    return bits | PUZZLE.boat_bit if state[0] == RIGHT else bits
+
+
+def bfs_packed(start, goal):
+    """和 bfs 相同的介面與回傳格式，但搜尋是在預先算好的狀態表上查表進行。"""
+    path, _ = TABLE.bfs(_pack(start), _pack(goal))
+    if path is None:
+        return None
+    return [(decode(bits, 4, LEFT, RIGHT), PASSENGERS[mv] if i else None)
+            for i, (bits, mv) in enumerate(path)]
+
+
 def print_solution(path):
     def side_str(s):
         return "人:{} 狼:{} 羊:{} 菜:{}".format(*s)
@@ -113,7 +136,7 @@ if __name__ == "__main__":
     start_state = (LEFT, LEFT, LEFT, LEFT)
     goal_state = (RIGHT, RIGHT, RIGHT, RIGHT)
 
-    path = bfs(start_state, goal_state)
+    path = bfs_packed(start_state, goal_state)
     if path is None:
         print("沒有找到解")
     else:
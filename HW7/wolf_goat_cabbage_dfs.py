@@ -79,12 +79,83 @@ def dfs(current: State,
     return False
 
 
-def print_solution(path: List[Tuple[State, Optional[str]]]):
+def dfs_iterative(start: State, goal: State) -> Optional[List[Tuple[State, Optional[str]]]]:
+    """
+    和 dfs 相同的搜尋順序，但用明確的堆疊取代遞迴，
+    狀態空間很深時也不會碰到 Python 的遞迴深度限制。
+    堆疊裡每一層存 (狀態, 還沒試過的鄰居 iterator)。
+    """
+    visited = {start}
+    path: List[Tuple[State, Optional[str]]] = [(start, None)]
+    stack = [iter(get_neighbors(start))]
+
+    while stack:
+        if path[-1][0] == goal:
+            return path
+        step = next(stack[-1], None)
+        if step is None:
+            # 這一層的鄰居都試完了 → 回溯
+            stack.pop()
+            path.pop()
+            continue
+        ns, passenger = step
+        if ns in visited:
+            continue
+        visited.add(ns)
+        path.append((ns, passenger))
+        stack.append(iter(get_neighbors(ns)))
+
+    return None
+
+
+def depth_limited_search(start: State, goal: State,
+                         limit: int) -> Optional[List[Tuple[State, Optional[str]]]]:
+    """
+    最多走 limit 步的 DFS（明確堆疊）。
+    只記錄目前這條路徑上的狀態來避免繞圈，記憶體 O(limit)。
+    """
+    path: List[Tuple[State, Optional[str]]] = [(start, None)]
+    on_path = {start}
+    stack = [iter(get_neighbors(start))]
+
+    while stack:
+        if path[-1][0] == goal:
+            return path
+        step = next(stack[-1], None) if len(path) <= limit else None
+        if step is None:
+            stack.pop()
+            on_path.discard(path.pop()[0])
+            continue
+        ns, passenger = step
+        if ns in on_path:
+            continue
+        on_path.add(ns)
+        path.append((ns, passenger))
+        stack.append(iter(get_neighbors(ns)))
+
+    return None
+
+
+def iddfs(start: State, goal: State,
+          max_depth: int = 64) -> Optional[List[Tuple[State, Optional[str]]]]:
+    """
+    迭代加深 DFS (IDDFS)：深度上限從 0 開始逐次加 1。
+    第一次找到解時的深度就是最短步數，和 BFS 一樣保證最短，
+    但只需要 O(深度) 的記憶體，不必像 BFS 保存整個 visited / parent。
+    """
+    for limit in range(max_depth + 1):
+        path = depth_limited_search(start, goal, limit)
+        if path is not None:
+            return path
+    return None
+
+
+def print_solution(path: List[Tuple[State, Optional[str]]], title: str = "DFS 找到的一組解："):
     
     def side_str(s: State) -> str:
         return "人:{} 狼:{} 羊:{} 菜:{}".format(*s)
 
-    print("DFS 找到的一組解：")
+    print(title)
     for i, (state, passenger) in enumerate(path):
         if i == 0:
             print(f"步驟 {i}: 起點          -> {side_str(state)}")
@@ -109,3 +180,10 @@ if __name__ == "__main__":
         print_solution(path)
     else:
         print("沒有找到解")
+
+    print()
+    shortest = iddfs(start_state, goal_state)
+    if shortest is None:
+        print("IDDFS 沒有找到解")
+    else:
+        print_solution(shortest, "IDDFS 找到的最短解：")
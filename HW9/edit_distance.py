@@ -1,7 +1,36 @@
-def edit_distance(s1: str, s2: str):
+def edit_distance(s1: str, s2: str, return_table: bool = False, method: str = "auto",
+                  max_distance: int = None):
     """
     計算字串 s1 與 s2 的最小編輯距離 (Levenshtein Distance)
     允許的操作：插入、刪除、取代，每個操作成本為 1
+    參數：
+      return_table: 是否建立並回傳完整的 DP 表（給 print_dp_table 用）
+      method:       不需要 DP 表時的計算方式
+                    "auto" / "bitparallel"：Myers / Hyyrö 位元平行法
+                    "dp"：一般 DP，只保留兩列
+      max_distance: 只想知道距離是否 <= k 時傳入 k，
+                    改用寬度 2k+1 的對角帶狀 DP，超過 k 就提早結束
+    回傳：
+      return_table=False：dist（記憶體 O(min(m, n))）；
+                          有 max_distance=k 且距離超過 k 時回傳 k + 1
+      return_table=True ：(dist, dp)，dp 是 (m+1) x (n+1) 的 2D list
+    """
+    if return_table:
+        if max_distance is not None:
+            raise ValueError("return_table 與 max_distance 不能同時使用")
+        return edit_distance_table(s1, s2)
+    if max_distance is not None:
+        return _edit_distance_banded(s1, s2, max_distance)
+    if method in ("auto", "bitparallel"):
+        return _edit_distance_bitparallel(s1, s2)
+    if method == "dp":
+        return _edit_distance_two_rows(s1, s2)
+    raise ValueError(f"未知的 method: {method}")
+
+
+def edit_distance_table(s1: str, s2: str):
+    """
+    建立完整的 DP 表計算編輯距離
     回傳：
       dist: 最小編輯距離
       dp:   動態規劃表 (2D list)，可用來觀察計算過程
@@ -36,6 +65,244 @@ def edit_distance(s1: str, s2: str):
     return dp[m][n], dp
 
 
+def _edit_distance_two_rows(s1, s2):
+    """
+    只保留「上一列」與「這一列」的 DP，記憶體 O(min(m, n))。
+    編輯距離是對稱的，所以讓較短的字串當作列的方向。
+    """
+    if len(s2) > len(s1):
+        s1, s2 = s2, s1
+    n = len(s2)
+
+    prev = list(range(n + 1))
+    for i in range(1, len(s1) + 1):
+        a = s1[i - 1]
+        cur = [i] + [0] * n
+        for j in range(1, n + 1):
+            cost = 0 if a == s2[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+        prev = cur
+    return prev[n]
+
+
+def _edit_distance_banded(s1, s2, k):
+    """
+    Ukkonen 的帶狀 DP：距離 <= k 的最佳路徑不會離開主對角線 k 格以外，
+    所以每一列只算 j ∈ [i-k, i+k] 這 2k+1 格，其餘視為 k+1（無限大）。
+    只要某一列的帶內最小值已經 > k，最後答案一定也 > k，直接回傳 k + 1。
+    列的方向取較短的字串，成本 O(k·min(m, n))。
+    """
+    if k < 0:
+        raise ValueError("max_distance 必須 >= 0")
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    m, n = len(s1), len(s2)     # m <= n
+    inf = k + 1
+    if n - m > k:
+        return inf
+
+    width = 2 * k + 1
+    # row[d] 對應 j = i - k + d；多留一格 inf，讓 prev[d + 1] 不會越界
+    prev = [j if 0 <= j <= n else inf for j in range(-k, k + 1)] + [inf]
+    for i in range(1, m + 1):
+        a = s1[i - 1]
+        cur = [inf] * (width + 1)
+        row_min = inf
+        for d in range(width):
+            j = i - k + d
+            if j < 0:
+                continue
+            if j > n:
+                break
+            if j == 0:
+                v = i
+            else:
+                v = prev[d] + (0 if a == s2[j - 1] else 1)   # 取代 / 相同
+                if prev[d + 1] + 1 < v:
+                    v = prev[d + 1] + 1                        # 刪除
+                if d > 0 and cur[d - 1] + 1 < v:
+                    v = cur[d - 1] + 1                         # 插入
+                if v > inf:
+                    v = inf
+            cur[d] = v
+            if v < row_min:
+                row_min = v
+        if row_min > k:
+            return inf
+        prev = cur
+    return prev[n - m + k]
+
+
+def _edit_distance_bitparallel(s1, s2):
+    """
+    Myers (1999) / Hyyrö (2001) 的位元平行 Levenshtein 距離。
+
+    把較短的字串當作 pattern，DP 的一整欄用一個 m 位元的整數表示
+    （每一格和上一格的差只會是 -1 / 0 / +1，用 Pv、Mv 兩個位元向量記錄），
+    每讀入 text 的一個字元，只需要常數次整數運算就能算出下一欄。
+    Python 的大整數內部以 word 為單位運算，所以總成本約 O(⌈m/w⌉·n)。
+    """
+    if len(s2) > len(s1):
+        s1, s2 = s2, s1
+    pattern, text = s2, s1
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+
+    # peq[c]：pattern 中字元 c 出現位置的位元遮罩
+    peq = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = mask, 0       # 一開始每一格都比上一格多 1（第 0 欄是 0, 1, 2, ..., m）
+    score = m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # 第 0 列是 0, 1, 2, ...，所以最上面一格的水平差固定是 +1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+# ================= Hirschberg：線性記憶體還原編輯步驟 =================
+# 編輯步驟以 (op, i, j) 表示，i / j 是 s1 / s2 的索引：
+#   ("match", i, j)      s1[i] == s2[j]，不需操作
+#   ("substitute", i, j) 把 s1[i] 取代成 s2[j]
+#   ("delete", i, None)  刪除 s1[i]
+#   ("insert", None, j)  插入 s2[j]
+
+# 子問題小於這個格數時，直接建整張表回溯，比繼續遞迴快
+_HIRSCHBERG_BASE_CELLS = 4096
+
+
+def _forward_row(a, alo, ahi, b, blo, bhi):
+    # row[j] = dist(a[alo:ahi], b[blo:blo+j])
+    n = bhi - blo
+    prev = list(range(n + 1))
+    for i in range(alo, ahi):
+        x = a[i]
+        cur = [prev[0] + 1] + [0] * n
+        for j in range(1, n + 1):
+            cost = 0 if x == b[blo + j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+        prev = cur
+    return prev
+
+
+def _reverse_row(a, alo, ahi, b, blo, bhi):
+    # row[j] = dist(a[alo:ahi], b[blo+j:bhi])，由後往前算
+    n = bhi - blo
+    prev = [n - j for j in range(n + 1)]
+    for i in range(ahi - 1, alo - 1, -1):
+        x = a[i]
+        cur = [0] * n + [prev[n] + 1]
+        for j in range(n - 1, -1, -1):
+            cost = 0 if x == b[blo + j] else 1
+            cur[j] = min(prev[j] + 1, cur[j + 1] + 1, prev[j + 1] + cost)
+        prev = cur
+    return prev
+
+
+def _table_script(a, alo, ahi, b, blo, bhi):
+    # 小區塊：建整張表，再從右下角回溯
+    m, n = ahi - alo, bhi - blo
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(m + 1):
+        dp[i][0] = i
+    for j in range(n + 1):
+        dp[0][j] = j
+    for i in range(1, m + 1):
+        x = a[alo + i - 1]
+        for j in range(1, n + 1):
+            cost = 0 if x == b[blo + j - 1] else 1
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
+
+    ops = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            same = a[alo + i - 1] == b[blo + j - 1]
+            if dp[i][j] == dp[i - 1][j - 1] + (0 if same else 1):
+                ops.append(("match" if same else "substitute", alo + i - 1, blo + j - 1))
+                i -= 1
+                j -= 1
+                continue
+        if i > 0 and dp[i][j] == dp[i - 1][j] + 1:
+            ops.append(("delete", alo + i - 1, None))
+            i -= 1
+        else:
+            ops.append(("insert", None, blo + j - 1))
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def _hirschberg(a, alo, ahi, b, blo, bhi):
+    m, n = ahi - alo, bhi - blo
+    if m == 0:
+        for j in range(blo, bhi):
+            yield ("insert", None, j)
+        return
+    if n == 0:
+        for i in range(alo, ahi):
+            yield ("delete", i, None)
+        return
+    if m == 1 or n == 1 or m * n <= _HIRSCHBERG_BASE_CELLS:
+        yield from _table_script(a, alo, ahi, b, blo, bhi)
+        return
+
+    # 把 a 從中間切開，找 b 的最佳切點 k，使左右兩半的距離和最小
+    mid = alo + m // 2
+    left = _forward_row(a, alo, mid, b, blo, bhi)
+    right = _reverse_row(a, mid, ahi, b, blo, bhi)
+    k = min(range(n + 1), key=lambda j: left[j] + right[j])
+    del left, right
+
+    yield from _hirschberg(a, alo, mid, b, blo, blo + k)
+    yield from _hirschberg(a, mid, ahi, b, blo + k, bhi)
+
+
+_SWAPPED_OP = {"match": "match", "substitute": "substitute",
+               "delete": "insert", "insert": "delete"}
+
+
+def iter_edit_script(s1, s2):
+    """
+    用 Hirschberg 演算法依序產生把 s1 變成 s2 的最佳編輯步驟 (op, i, j)。
+    每層遞迴只保留兩列 DP，列的長度取較短的字串，記憶體 O(min(m, n))。
+    s1、s2 可以是字串，也可以是任何支援索引與 == 比較的序列。
+    """
+    if len(s2) > len(s1):
+        # 讓較短的 s2 當作 DP 列的方向，輸出時再把插入 / 刪除對調回來
+        for op, i, j in _hirschberg(s2, 0, len(s2), s1, 0, len(s1)):
+            yield (_SWAPPED_OP[op], j, i)
+    else:
+        yield from _hirschberg(s1, 0, len(s1), s2, 0, len(s2))
+
+
+def edit_script(s1, s2):
+    """
+    回傳：
+      dist: 最小編輯距離
+      ops:  最佳編輯步驟 list[(op, i, j)]，格式見 iter_edit_script
+    """
+    ops = list(iter_edit_script(s1, s2))
+    dist = sum(1 for op, _, _ in ops if op != "match")
+    return dist, ops
+
+
 def print_dp_table(s1: str, s2: str, dp):
     """
     把 DP 表格印得比較漂亮，方便學習與觀察。
@@ -60,12 +327,31 @@ def print_dp_table(s1: str, s2: str, dp):
         print()
 
 
+def print_edit_script(s1: str, s2: str, ops):
+    """
+    把編輯步驟印成上下對齊的三列：s1、操作符號、s2。
+    「|」相同、「*」取代、「-」刪除、「+」插入。
+    """
+    top, mid, bottom = [], [], []
+    for op, i, j in ops:
+        top.append(s1[i] if i is not None else "-")
+        bottom.append(s2[j] if j is not None else "-")
+        mid.append({"match": "|", "substitute": "*", "delete": "-", "insert": "+"}[op])
+    print(" ".join(top))
+    print(" ".join(mid))
+    print(" ".join(bottom))
+
+
 if __name__ == "__main__":
     s1 = input("請輸入字串1：")
     s2 = input("請輸入字串2：")
 
-    dist, dp = edit_distance(s1, s2)
+    dist, dp = edit_distance(s1, s2, return_table=True)
     print(f"\n「{s1}」 變成 「{s2}」 的最小編輯距離為：{dist}\n")
 
     print("DP 表格如下（可用來觀察動態規劃過程）：")
     print_dp_table(s1, s2, dp)
+
+    print("\n一組最佳的編輯步驟（Hirschberg，線性記憶體）：")
+    _, ops = edit_script(s1, s2)
+    print_edit_script(s1, s2, ops)
@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _encode(strings):
+    """
+    把一批字串轉成補齊長度的整數陣列（Unicode code point）。
+    回傳 codes shape: (P, L)，lengths shape: (P,)
+    """
+    lengths = np.array([len(s) for s in strings], dtype=np.int32)
+    width = int(lengths.max()) if len(strings) else 0
+    codes = np.full((len(strings), max(width, 1)), -1, dtype=np.int32)
+    for k, s in enumerate(strings):
+        if s:
+            codes[k, :len(s)] = np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32)
+    return codes, lengths
+
+
+def _wavefront(codes_a, lens_a, codes_b, lens_b):
+    """
+    一次計算 P 組字串對的編輯距離：沿著反對角線 (i + j = d) 推進 DP。
+
+    同一條反對角線上的格子彼此不相依，只需要前兩條反對角線，
+    所以每一步都能對「所有字串對 × 整條反對角線」做一次向量運算，
+    Python 迴圈只跑 max(m) + max(n) 次。
+    diag[:, i] 存放 dp[i][d - i]。
+    """
+    P = codes_a.shape[0]
+    M = int(lens_a.max())
+    N = int(lens_b.max())
+    target = lens_a + lens_b           # 每一對的答案落在第 target 條反對角線
+    result = np.zeros(P, dtype=np.int32)
+
+    order = np.argsort(target, kind="stable")
+    sorted_target = target[order]
+
+    prev2 = np.zeros((P, M + 1), dtype=np.int32)   # d - 2
+    prev1 = np.zeros((P, M + 1), dtype=np.int32)   # d - 1
+    cur = np.zeros((P, M + 1), dtype=np.int32)     # d
+    # d = 0：dp[0][0] = 0，答案在第 0 條的是兩個空字串，result 已經是 0
+
+    for d in range(1, M + N + 1):
+        # 邊界：dp[0][d] = d、dp[d][0] = d
+        if d <= N:
+            cur[:, 0] = d
+        if d <= M:
+            cur[:, d] = d
+        # 內部格子 i ∈ [max(1, d-N), min(M, d-1)]，j = d - i
+        lo, hi = max(1, d - N), min(M, d - 1)
+        if lo <= hi:
+            ii = np.arange(lo, hi + 1)
+            jj = d - ii
+            cost = (codes_a[:, ii - 1] != codes_b[:, jj - 1]).astype(np.int32)
+            np.minimum(prev1[:, lo - 1:hi] + 1,            # dp[i-1][j] + 1 刪除
+                       prev1[:, lo:hi + 1] + 1,            # dp[i][j-1] + 1 插入
+                       out=cur[:, lo:hi + 1])
+            np.minimum(cur[:, lo:hi + 1],
+                       prev2[:, lo - 1:hi] + cost,         # dp[i-1][j-1] + cost
+                       out=cur[:, lo:hi + 1])
+
+        # 收集答案剛好在這條反對角線上的字串對
+        start = np.searchsorted(sorted_target, d, side="left")
+        stop = np.searchsorted(sorted_target, d, side="right")
+        if start < stop:
+            idx = order[start:stop]
+            result[idx] = cur[idx, lens_a[idx]]
+
+        prev2, prev1, cur = prev1, cur, prev2
+    return result
+
+
+def _pairs_distances(queries, corpus, qi, ci, chunk_size):
+    """計算 (queries[qi[k]], corpus[ci[k]]) 這些字串對的距離。"""
+    out = np.empty(len(qi), dtype=np.int32)
+    if len(qi) == 0:
+        return out
+    q_codes, q_lens = _encode(queries)
+    c_codes, c_lens = _encode(corpus)
+
+    # 依長度排序後再分塊，讓同一塊裡的字串長度接近，減少補齊浪費的格子
+    order = np.lexsort((c_lens[ci], q_lens[qi]))
+    for start in range(0, len(order), chunk_size):
+        idx = order[start:start + chunk_size]
+        a, b = qi[idx], ci[idx]
+        la, lb = q_lens[a], c_lens[b]
+        wa = max(int(la.max()), 1)
+        wb = max(int(lb.max()), 1)
+        out[idx] = _wavefront(q_codes[a, :wa], la, c_codes[b, :wb], lb)
+    return out
+
+
+def _matrix_block(queries, row_offset, corpus, symmetric, chunk_size):
+    """process pool 的工作單位：一段連續的列（queries 的一部分）對整個 corpus。"""
+    rows = len(queries)
+    qi, ci = np.meshgrid(np.arange(rows), np.arange(len(corpus)), indexing="ij")
+    qi, ci = qi.ravel(), ci.ravel()
+    if symmetric:
+        # 對稱矩陣只算上三角（不含對角線）
+        keep = ci > qi + row_offset
+        qi, ci = qi[keep], ci[keep]
+    return row_offset, qi, ci, _pairs_distances(queries, corpus, qi, ci, chunk_size)
+
+
+def edit_distance_matrix(queries, corpus=None, workers=None, chunk_size=2048):
+    """
+    計算 queries × corpus 的編輯距離矩陣。
+
+    參數：
+      queries:    list[str]
+      corpus:     list[str]；None 代表計算 queries 自己的 all-pairs 對稱矩陣，
+                  此時只算上三角再鏡射
+      workers:    process 數，None 代表 os.cpu_count()，1 代表不開 pool
+      chunk_size: 每次向量化一起算的字串對數（越大越快，但記憶體也越多）
+    回傳：
+      np.ndarray, shape (len(queries), len(corpus))，dtype int32
+    """
+    queries = list(queries)
+    symmetric = corpus is None
+    corpus = queries if symmetric else list(corpus)
+    matrix = np.zeros((len(queries), len(corpus)), dtype=np.int32)
+    if len(queries) == 0 or len(corpus) == 0:
+        return matrix
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # 把列切成多塊，讓 pool 可以平衡各 worker 的負擔（上三角越下面越少）
+    n_blocks = min(len(queries), max(1, workers * 4))
+    bounds = np.linspace(0, len(queries), n_blocks + 1).astype(int)
+    tasks = [(queries[lo:hi], lo, corpus, symmetric, chunk_size)
+             for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    if workers <= 1:
+        blocks = [_matrix_block(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(_matrix_block, *zip(*tasks)))
+
+    for row_offset, qi, ci, dist in blocks:
+        matrix[qi + row_offset, ci] = dist
+    if symmetric:
+        matrix = matrix + matrix.T
+    return matrix
+
+
+def edit_distance_one_to_many(query, corpus, workers=1, chunk_size=2048):
+    """一個查詢字串對整個 corpus 的編輯距離，回傳 shape (len(corpus),)。"""
+    return edit_distance_matrix([query], corpus, workers=workers, chunk_size=chunk_size)[0]
+
+
+if __name__ == "__main__":
+    words = ["kitten", "sitting", "mitten", "fitting", "sitter", "kitchen"]
+    print("all-pairs 編輯距離矩陣：")
+    dist = edit_distance_matrix(words, workers=1)
+    print(" " * 8 + " ".join(f"{w:>8s}" for w in words))
+    for w, row in zip(words, dist):
+        print(f"{w:>8s}" + " ".join(f"{d:8d}" for d in row))
+
+    print("\n「sittin」 對每個字的距離：", edit_distance_one_to_many("sittin", words))
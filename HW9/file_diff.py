@@ -0,0 +1,162 @@
+import argparse
+import mmap
+import re
+import sys
+from array import array
+
+from edit_distance import edit_distance, iter_edit_script
+
+_TOKEN_RE = re.compile(rb"\S+")
+
+
+class MappedTokens:
+    """
+    以 mmap 開啟一個檔案，把每一行（或每個以空白分隔的 token）雜湊成整數。
+
+    只保存每個單位的起訖位置與雜湊值（各 8 bytes），內容留在作業系統的
+    page cache 裡，需要輸出時再用 text(i) 從 mmap 取出，
+    所以數 GB 的檔案也不必整個讀成 Python 字串。
+    物件本身就是雜湊值的序列（支援 len 與索引），可以直接交給編輯距離函式。
+    """
+
+    def __init__(self, path, unit="line"):
+        if unit not in ("line", "token"):
+            raise ValueError(f"未知的 unit: {unit}")
+        self.path = path
+        self._fp = open(path, "rb")
+        size = self._fp.seek(0, 2)
+        # 空檔案無法 mmap，用空的 bytes 代替
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.starts = array("q")
+        self.ends = array("q")
+        self.hashes = array("q")
+        if unit == "line":
+            self._scan_lines(size)
+        else:
+            self._scan_tokens()
+
+    def _scan_lines(self, size):
+        mm = self._mm
+        pos = 0
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            end = size if nl == -1 else nl
+            self._append(pos, end)
+            pos = end + 1
+
+    def _scan_tokens(self):
+        for m in _TOKEN_RE.finditer(self._mm):
+            self._append(m.start(), m.end())
+
+    def _append(self, start, end):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.hashes.append(hash(self._mm[start:end]))
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getitem__(self, i):
+        return self.hashes[i]
+
+    def text(self, i):
+        """取出第 i 個單位的原始內容 (bytes)。"""
+        return self._mm[self.starts[i]:self.ends[i]]
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _common_affixes(a, b):
+    """
+    相同的開頭與結尾不影響編輯距離，先剝掉，只對中間不同的部分做 DP。
+    a、b 是 MappedTokens；雜湊相同時再比對一次原始內容，碰撞的兩行不會被當成相同。
+    """
+    def same(i, j):
+        return a[i] == b[j] and a.text(i) == b.text(j)
+
+    n = min(len(a), len(b))
+    prefix = 0
+    while prefix < n and same(prefix, prefix):
+        prefix += 1
+    suffix = 0
+    while suffix < n - prefix and same(len(a) - 1 - suffix, len(b) - 1 - suffix):
+        suffix += 1
+    return prefix, suffix
+
+
+def file_edit_distance(path_a, path_b, unit="line"):
+    """兩個檔案以行（或 token）為單位的編輯距離。"""
+    with MappedTokens(path_a, unit) as a, MappedTokens(path_b, unit) as b:
+        prefix, suffix = _common_affixes(a, b)
+        return edit_distance(a.hashes[prefix:len(a) - suffix],
+                             b.hashes[prefix:len(b) - suffix])
+
+
+def iter_file_diff(path_a, path_b, unit="line"):
+    """
+    依序產生兩個檔案的差異 (symbol, text)：
+      " " 兩邊相同、"-" 只在 a、"+" 只在 b
+    編輯步驟由 Hirschberg 演算法邊算邊輸出，記憶體 O(min(m, n))。
+    雜湊碰撞時兩個不同的單位會被當成相同，輸出前會再比對一次原始內容。
+    """
+    with MappedTokens(path_a, unit) as a, MappedTokens(path_b, unit) as b:
+        prefix, suffix = _common_affixes(a, b)
+        for i in range(prefix):
+            yield " ", a.text(i)
+
+        mid_a = a.hashes[prefix:len(a) - suffix]
+        mid_b = b.hashes[prefix:len(b) - suffix]
+        for op, i, j in iter_edit_script(mid_a, mid_b):
+            if op == "match" and a.text(prefix + i) == b.text(prefix + j):
+                yield " ", a.text(prefix + i)
+            elif op in ("match", "substitute"):
+                yield "-", a.text(prefix + i)
+                yield "+", b.text(prefix + j)
+            elif op == "delete":
+                yield "-", a.text(prefix + i)
+            else:
+                yield "+", b.text(prefix + j)
+
+        for i in range(len(a) - suffix, len(a)):
+            yield " ", a.text(i)
+
+
+def write_file_diff(path_a, path_b, out=None, unit="line", context=True):
+    """
+    把差異寫到 out（預設 stdout），回傳有差異（"-" 或 "+"）的行數。
+    context=False 時只輸出有差異的行。
+    """
+    out = out or sys.stdout
+    changed = 0
+    for symbol, text in iter_file_diff(path_a, path_b, unit):
+        if symbol != " ":
+            changed += 1
+        elif not context:
+            continue
+        out.write(f"{symbol} {text.decode('utf-8', errors='replace')}\n")
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="以行或 token 為單位比較兩個大檔案")
+    parser.add_argument("file_a")
+    parser.add_argument("file_b")
+    parser.add_argument("--unit", choices=["line", "token"], default="line")
+    parser.add_argument("--distance-only", action="store_true", help="只計算編輯距離")
+    parser.add_argument("--changes-only", action="store_true", help="只輸出有差異的行")
+    args = parser.parse_args()
+
+    if args.distance_only:
+        print(file_edit_distance(args.file_a, args.file_b, args.unit))
+    else:
+        write_file_diff(args.file_a, args.file_b, unit=args.unit,
+                        context=not args.changes_only)
@@ -0,0 +1,185 @@
+import heapq
+import pickle
+
+from edit_distance import edit_distance
+
+
+class BKTree:
+    """
+    BK-tree：以編輯距離建立的模糊搜尋索引。
+
+    每個節點存一個字，子節點依「和父節點的距離」分邊。
+    查詢距離 <= k 的字時，若查詢字和節點的距離是 d，由三角不等式
+    只有邊長落在 [d-k, d+k] 的子樹可能有答案，其餘整棵子樹都可以跳過。
+
+    節點存在平坦的 list 裡（words[i]、children[i] = {距離: 子節點編號}），
+    不用遞迴，大量字詞時也不會碰到 Python 的遞迴深度限制，且方便存檔。
+    """
+
+    def __init__(self, words=()):
+        self.words = []
+        self.children = []
+        self.last_visits = 0   # 上一次查詢實際計算了幾次編輯距離
+        for w in words:
+            self.add(w)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word):
+        """把 word 加入索引（重複的字會被忽略）。"""
+        if not self.words:
+            self.words.append(word)
+            self.children.append({})
+            return
+        node = 0
+        while True:
+            d = edit_distance(word, self.words[node])
+            if d == 0:
+                return
+            child = self.children[node].get(d)
+            if child is None:
+                self.words.append(word)
+                self.children.append({})
+                self.children[node][d] = len(self.words) - 1
+                return
+            node = child
+
+    def query(self, word, k):
+        """
+        找出所有和 word 距離 <= k 的字。
+        回傳：list[(dist, word)]，依距離、字典順序排序
+        """
+        results = []
+        self.last_visits = 0
+        if not self.words:
+            return results
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            d = edit_distance(word, self.words[node])
+            self.last_visits += 1
+            if d <= k:
+                results.append((d, self.words[node]))
+            for edge, child in self.children[node].items():
+                if d - k <= edge <= d + k:
+                    stack.append(child)
+        results.sort()
+        return results
+
+    def nearest(self, word, n=1):
+        """
+        找出和 word 最接近的 n 個字。
+        搜尋半徑從無限大開始，每找到更近的候選就縮小，剪枝效果隨之變強。
+        回傳：list[(dist, word)]，依距離、字典順序排序
+        """
+        self.last_visits = 0
+        if not self.words or n <= 0:
+            return []
+        best = []          # 最大堆積（存負距離），保留目前最近的 n 個
+        radius = float("inf")
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            d = edit_distance(word, self.words[node])
+            self.last_visits += 1
+            if len(best) < n:
+                heapq.heappush(best, (-d, self.words[node]))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, self.words[node]))
+            if len(best) == n:
+                radius = -best[0][0]
+            # 和 d 最接近的邊最可能有更近的字，讓它最後入堆疊、最先被展開
+            edges = sorted(self.children[node].items(), key=lambda e: -abs(e[0] - d))
+            for edge, child in edges:
+                if abs(edge - d) <= radius:
+                    stack.append(child)
+        return sorted((-nd, w) for nd, w in best)
+
+    def save(self, path):
+        """把索引存到檔案，之後可用 BKTree.load 直接載入，不必重建。"""
+        with open(path, "wb") as fp:
+            pickle.dump((self.words, self.children), fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        tree = cls()
+        with open(path, "rb") as fp:
+            tree.words, tree.children = pickle.load(fp)
+        return tree
+
+
+class IncrementalMatcher:
+    """
+    打字提示 (type-ahead) 用的增量編輯距離。
+
+    查詢字串每次多一個字元，就只在每個候選字的 DP 表下方多算一列：
+      row[j] = dist(query[:i], candidate[:j])
+    新的一列只依賴上一列，成本 O(len(candidate))，不必整張表重算。
+    每個候選字都保留每一列，所以退格 (pop) 只要丟掉最後一列。
+    """
+
+    def __init__(self, candidates):
+        self.candidates = list(candidates)
+        self.query = ""
+        # rows[c] 是第 c 個候選字的列堆疊，第 0 列是 0, 1, ..., len(candidate)
+        self.rows = [[list(range(len(c) + 1))] for c in self.candidates]
+
+    def push(self, chars):
+        """查詢字串尾端加上 chars（可以一次加多個字元）。"""
+        for ch in chars:
+            i = len(self.query) + 1
+            for cand, stack in zip(self.candidates, self.rows):
+                prev = stack[-1]
+                cur = [i] + [0] * len(cand)
+                for j in range(1, len(cand) + 1):
+                    cost = 0 if ch == cand[j - 1] else 1
+                    cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+                stack.append(cur)
+            self.query += ch
+
+    def pop(self):
+        """退格：刪掉查詢字串的最後一個字元。"""
+        if not self.query:
+            return
+        for stack in self.rows:
+            stack.pop()
+        self.query = self.query[:-1]
+
+    def distances(self):
+        """目前的查詢字串和每個候選字（整個字）的編輯距離。"""
+        return [stack[-1][-1] for stack in self.rows]
+
+    def prefix_distances(self):
+        """目前的查詢字串和每個候選字「最接近的前綴」的編輯距離。"""
+        return [min(stack[-1]) for stack in self.rows]
+
+    def matches(self, k, prefix=True):
+        """
+        找出距離 <= k 的候選字。
+        prefix=True 時比較的是候選字的前綴（還沒打完的字也算符合）。
+        回傳：list[(dist, candidate)]，依距離、字典順序排序
+        """
+        dists = self.prefix_distances() if prefix else self.distances()
+        return sorted((d, c) for d, c in zip(dists, self.candidates) if d <= k)
+
+
+if __name__ == "__main__":
+    words = ["book", "books", "boo", "boon", "cook", "cake", "cape", "cart",
+             "look", "hook", "brook", "bake", "take", "tale", "tall", "ball"]
+    tree = BKTree(words)
+
+    query = input("請輸入要查詢的字：")
+    k = int(input("允許的最大編輯距離 k："))
+
+    matches = tree.query(query, k)
+    print(f"\n距離 <= {k} 的字：{matches}")
+    print(f"（只計算了 {tree.last_visits} / {len(tree)} 個字的編輯距離）")
+
+    print(f"\n最接近的 3 個字：{tree.nearest(query, n=3)}")
+
+    print("\n逐字輸入的提示（前綴距離 <= 1）：")
+    matcher = IncrementalMatcher(words)
+    for ch in query:
+        matcher.push(ch)
+        print(f"  {matcher.query!r:10s} -> {[w for _, w in matcher.matches(1)]}")